@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+Live roster updates (games/<code>/live/) only stream under ASGI, e.g.:
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+
+Exports stream under either server; see games/exports.py.
 """
 
 import os
@@ -0,0 +1,72 @@
+"""Database profile.
+
+Without DATABASE_URL this is the SQLite file next to manage.py, tuned for
+several gunicorn workers writing at once:
+
+- WAL lets readers carry on while one writer commits, and
+  synchronous=NORMAL is the usual durability/speed trade-off for WAL.
+- busy_timeout makes a connection wait for the write lock instead of
+  failing straight away with "database is locked".
+- Transactions start with BEGIN IMMEDIATE, so a write transaction takes the
+  write lock up front and queues behind the busy timeout. A DEFERRED
+  transaction that reads first and then writes can't wait for the lock; it
+  fails instead.
+- Connections are kept for CONN_MAX_AGE seconds instead of reopened on every
+  request.
+
+The pragmas are run by Django on every new connection (OPTIONS
+init_command).
+
+With DATABASE_URL (e.g. postgres://...), the same settings come from
+dj-database-url. PostgreSQL uses Django's built-in connection pool
+(psycopg[pool]) unless DB_POOL=False. Other servers keep persistent
+connections with health checks.
+"""
+import os
+
+import dj_database_url
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # ms
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -20000,  # negative = KiB, so ~20 MB per connection
+    "temp_store": "MEMORY",
+}
+
+
+def sqlite_init_command(pragmas=None) -> str:
+    return "".join(f"PRAGMA {name}={value};" for name, value in (pragmas or SQLITE_PRAGMAS).items())
+
+
+def database_config(base_dir, environ=os.environ) -> dict:
+    """The DATABASES["default"] entry for this environment."""
+    conn_max_age = int(environ.get("DB_CONN_MAX_AGE", "600"))
+    url = environ.get("DATABASE_URL")
+
+    if not url:
+        return {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": base_dir / "db.sqlite3",
+            "CONN_MAX_AGE": conn_max_age,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "init_command": sqlite_init_command(),
+                "transaction_mode": "IMMEDIATE",
+            },
+        }
+
+    config = dj_database_url.parse(url, conn_max_age=conn_max_age, conn_health_checks=True)
+    if config["ENGINE"] == "django.db.backends.postgresql" and environ.get("DB_POOL", "True") == "True":
+        # the pool replaces persistent connections; Django refuses both at once
+        config["CONN_MAX_AGE"] = 0
+        config.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": int(environ.get("DB_POOL_MIN", "2")),
+            "max_size": int(environ.get("DB_POOL_MAX", "10")),
+        }
+    elif config["ENGINE"] == "django.db.backends.sqlite3":
+        config.setdefault("OPTIONS", {}).update(
+            init_command=sqlite_init_command(), transaction_mode="IMMEDIATE",
+        )
+    return config
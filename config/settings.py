@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 import os
 
+from .database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -54,6 +56,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'games.metrics.TimingMiddleware',  # Server-Timing + /dashboard/metrics/; first so it sees everything
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # ✅ static files on Render
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -68,7 +71,7 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'games.metrics.TimedDjangoTemplates',  # DjangoTemplates + render timing
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -78,6 +81,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'games.context_processors.global_news',  # ✅ News bar on every page
+                'games.context_processors.organizer',
             ],
         },
     },
@@ -90,14 +94,51 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # =========================
 
+# SQLite tuned for concurrent workers, or DATABASE_URL for a server database.
+# See config/database.py.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(BASE_DIR),
 }
 
 
+# =========================
+# Cache
+# =========================
+
+# In-process cache by default; set CACHE_DIR to share entries between workers
+# through the filesystem without running a cache server.
+if os.environ.get("CACHE_DIR"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ["CACHE_DIR"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pickupplay",
+        }
+    }
+
+
+# =========================
+# Sessions
+# =========================
+
+# With a shared cache (CACHE_DIR), session reads come from the cache and
+# writes go to both cache and DB. The in-process default cache would let one
+# worker keep serving a session another worker already changed or logged
+# out, so without CACHE_DIR sessions stay in the DB. Clear expired rows with
+# clear_expired_sessions.
+SESSION_ENGINE = os.environ.get(
+    "SESSION_ENGINE",
+    "django.contrib.sessions.backends.cached_db" if os.environ.get("CACHE_DIR")
+    else "django.contrib.sessions.backends.db",
+)
+
+
 # =========================
 # Password validation
 # =========================
@@ -147,3 +188,34 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Organizer secret code from environment for production safety
 ORGANIZER_CODE = os.environ.get("ORGANIZER_CODE", "dev-organizer-code")
+
+# Access codes of games that ended this long ago may be handed to new games
+ACCESS_CODE_RECYCLE_AFTER_DAYS = int(os.environ.get("ACCESS_CODE_RECYCLE_AFTER_DAYS", "180"))
+
+# Fan-out for live roster updates (games.live). The in-process backend only
+# reaches SSE clients connected to the same ASGI worker.
+LIVE_ROSTER_BACKEND = os.environ.get("LIVE_ROSTER_BACKEND", "games.live.InProcessBackend")
+
+# Activity retention (manage.py archive_activity)
+ACTIVITY_RETENTION_DAYS = int(os.environ.get("ACTIVITY_RETENTION_DAYS", "90"))
+ACTIVITY_ARCHIVE_DIR = os.environ.get("ACTIVITY_ARCHIVE_DIR", str(BASE_DIR / "archive" / "activity"))
+
+# Throttling of code/password guessing (games/throttle.py).
+# scope -> {"ip" | "target": (attempts per minute, burst)}
+THROTTLE_RATES = {
+    "enter_code": {"ip": (20, 30)},
+    # unknown codes looked up directly by URL (any method); hits are free
+    "code_lookup": {"ip": (20, 30)},
+    "player_portal_login": {"ip": (10, 20), "target": (5, 10)},
+    # per-IP only: a shared bucket for the one organizer code would let
+    # anyone lock the organizer out with wrong guesses
+    "organizer_login": {"ip": (5, 10)},
+}
+# Only behind a proxy that sets X-Forwarded-For (e.g. Render)
+THROTTLE_TRUST_X_FORWARDED_FOR = os.environ.get("THROTTLE_TRUST_X_FORWARDED_FOR", "False") == "True"
+
+# Registration intake (games/intake.py): "direct" writes each sign-up in the
+# request; "buffered" queues them and a background thread batch-inserts them.
+REGISTRATION_INTAKE = os.environ.get("REGISTRATION_INTAKE", "direct")
+INTAKE_BATCH_SIZE = int(os.environ.get("INTAKE_BATCH_SIZE", "200"))
+INTAKE_FLUSH_SECONDS = float(os.environ.get("INTAKE_FLUSH_SECONDS", "0.25"))
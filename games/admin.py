@@ -1,20 +1,67 @@
+from collections import Counter
+
 from django.contrib import admin
+
+from . import roster
+from .forms import GameForm, RegistrationAdminForm
 from .models import Game, Registration, Announcement
 
 
 @admin.register(Game)
 class GameAdmin(admin.ModelAdmin):
-    list_display = ("title", "location", "start_time", "end_time", "capacity", "access_code")
-    readonly_fields = ("access_code", "created_at")
+    list_display = (
+        "title", "location", "start_time", "end_time", "capacity", "access_code",
+        "confirmed_count", "waitlist_count", "pending_count",
+    )
+    readonly_fields = ("access_code", "confirmed_count", "waitlist_count", "pending_count", "created_at")
     list_filter = ("location", "start_time")
     search_fields = ("title", "location", "access_code")
 
+    def save_model(self, request, obj, form, change):
+        if not change:
+            super().save_model(request, obj, form, change)
+            return
+        # only write the edited fields so roster counters aren't clobbered
+        obj.save(update_fields=GameForm.Meta.fields)
+        roster.bump_version(obj)
+
 
 @admin.register(Registration)
 class RegistrationAdmin(admin.ModelAdmin):
+    form = RegistrationAdminForm
     list_display = ("name", "email", "phone", "game", "status", "position", "created_at")
     list_filter = ("status", "game")
     search_fields = ("name", "email", "phone")
+    # status and position only change through games.roster (manage game page)
+    readonly_fields = ("status", "position")
+
+    def get_readonly_fields(self, request, obj=None):
+        # moving a registration to another game would skip both games' counters
+        return self.readonly_fields + (("game",) if obj else ())
+
+    # Edits here skip the manage game page, so keep the game's counters and
+    # cached public roster in step by hand. The admin already runs these in
+    # a transaction, so they stick to F() updates rather than taking the
+    # game lock. A deleted confirmed player's spot isn't refilled from the
+    # waitlist; use Remove on the manage game page for that.
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change:
+            roster.bump_version(obj.game)
+        else:
+            roster.adjust_counts(obj.game_id, Counter({obj.status: 1}))
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, Registration.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        steps = {}
+        for game_id, status in queryset.values_list("game_id", "status"):
+            steps.setdefault(game_id, Counter())[status] -= 1
+        super().delete_queryset(request, queryset)
+        for game in Game.objects.filter(pk__in=steps):
+            roster.adjust_counts(game.pk, steps[game.pk])
+            roster.recalc_positions(game)
 
 
 @admin.register(Announcement)
@@ -0,0 +1,118 @@
+"""Activity retention: move old Activity rows into compressed JSONL archives.
+
+Archives live under settings.ACTIVITY_ARCHIVE_DIR as
+YYYY/MM/activity-YYYY-MM-DD.jsonl.gz, one file per UTC day. Each run appends
+one gzip member per chunk, which gzip readers treat as one stream. Rows are
+moved a chunk at a time: the chunk is written and fsynced first, then
+deleted in its own short transaction, so SQLite's write lock is only held
+for one small DELETE at a time. If a run dies between the write and the
+delete, the next run archives those rows again; search() drops the repeated
+ids.
+"""
+import gzip
+import json
+import os
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Activity
+
+CHUNK_SIZE = 1000
+
+FIELDS = ["id", "game_id", "game__access_code", "game__title", "registration_id", "kind", "message", "created_at"]
+
+
+def archive_dir() -> Path:
+    return Path(settings.ACTIVITY_ARCHIVE_DIR)
+
+
+def _path_for(day: date) -> Path:
+    return archive_dir() / f"{day:%Y}" / f"{day:%m}" / f"activity-{day.isoformat()}.jsonl.gz"
+
+
+def _day_of(dt: datetime) -> date:
+    return dt.astimezone(dt_timezone.utc).date()
+
+
+def _append(day: date, rows: list) -> None:
+    path = _path_for(day)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+            for row in rows:
+                gz.write((json.dumps(row, cls=DjangoJSONEncoder) + "\n").encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archive_older_than(days: int, chunk_size: int = CHUNK_SIZE, pause: float = 0.0, dry_run: bool = False) -> int:
+    """Archive and delete activity older than ``days``. Returns rows moved."""
+    cutoff = timezone.now() - timedelta(days=days)
+    old = Activity.objects.filter(created_at__lt=cutoff).order_by("created_at", "id")
+    if dry_run:
+        return old.count()
+
+    moved = 0
+    while True:
+        chunk = list(old.values(*FIELDS)[:chunk_size])
+        if not chunk:
+            return moved
+
+        by_day = {}
+        for row in chunk:
+            row["game_code"] = row.pop("game__access_code")
+            row["game_title"] = row.pop("game__title")
+            by_day.setdefault(_day_of(row["created_at"]), []).append(row)
+        for day, rows in by_day.items():
+            _append(day, rows)
+
+        with transaction.atomic():
+            Activity.objects.filter(id__in=[row["id"] for row in chunk]).delete()
+        moved += len(chunk)
+
+        if pause:
+            time.sleep(pause)  # let queued writers in between chunks
+
+
+def _days(since: date = None, until: date = None):
+    root = archive_dir()
+    if not root.exists():
+        return
+    for path in sorted(root.glob("*/*/activity-*.jsonl.gz")):
+        day = date.fromisoformat(path.name[len("activity-"):-len(".jsonl.gz")])
+        if (since and day < since) or (until and day > until):
+            continue
+        yield day, path
+
+
+def search(text: str = None, game_id: int = None, game_code: str = None, kind: str = None,
+           since: date = None, until: date = None):
+    """Yield archived activity dicts matching every given filter, oldest first.
+
+    Only files for days inside ``since``..``until`` (inclusive) are opened.
+    """
+    needle = text.lower() if text else None
+    kind = kind.upper() if kind else None
+    for _, path in _days(since, until):
+        seen = set()  # a re-archived row lands in the same day's file
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                if row["id"] in seen:
+                    continue
+                seen.add(row["id"])
+                if game_id is not None and row["game_id"] != game_id:
+                    continue
+                if game_code and row["game_code"] != game_code:
+                    continue
+                if kind and row["kind"] != kind:
+                    continue
+                if needle and needle not in row["message"].lower():
+                    continue
+                yield row
@@ -0,0 +1,106 @@
+"""Access code allocation.
+
+Codes come from walking a keyed pseudo-random permutation of 00000–99999
+with a counter stored in AccessCodeCursor. Reserving a block of codes is one
+UPDATE on the counter, so concurrent creates always get disjoint codes and
+the cost doesn't depend on how many codes are taken. After a full lap the
+walk reaches codes again; ones held by games that ended long ago are
+recycled, and ones still in use are skipped.
+"""
+import hashlib
+import hmac
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AccessCodeCursor, Game
+
+CODE_SPACE = 100_000
+
+# Balanced Feistel network on 18 bits (2 × 9); values >= CODE_SPACE are
+# cycle-walked back into range.
+_HALF_BITS = 9
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_ROUNDS = 4
+
+
+class CodeSpaceExhausted(Exception):
+    """Every access code is held by a game that can't be recycled yet."""
+
+
+def _key() -> bytes:
+    return hashlib.sha256(f"pickupplay.access-codes:{settings.SECRET_KEY}".encode()).digest()
+
+
+def _feistel(x: int, key: bytes) -> int:
+    left, right = x >> _HALF_BITS, x & _HALF_MASK
+    for i in range(_ROUNDS):
+        digest = hmac.new(key, f"{i}:{right}".encode(), hashlib.sha256).digest()
+        left, right = right, left ^ (int.from_bytes(digest[:4], "big") & _HALF_MASK)
+    return (left << _HALF_BITS) | right
+
+
+def code_for_index(index: int, key: bytes = None) -> str:
+    """The code at ``index`` in the sequence (wraps every CODE_SPACE)."""
+    key = key or _key()
+    x = index % CODE_SPACE
+    while True:
+        x = _feistel(x, key)
+        if x < CODE_SPACE:
+            return f"{x:05d}"
+
+
+def _reserve(count: int) -> int:
+    """Advance the cursor by ``count`` and return the first reserved index."""
+    for _ in range(2):
+        if AccessCodeCursor.objects.filter(pk=1).update(next_index=F("next_index") + count):
+            return AccessCodeCursor.objects.values_list("next_index", flat=True).get(pk=1) - count
+        try:
+            with transaction.atomic():
+                AccessCodeCursor.objects.create(pk=1, next_index=count)
+            return 0
+        except IntegrityError:
+            # someone else created the row first; retry the UPDATE
+            continue
+    raise RuntimeError("Could not reserve access codes.")
+
+
+def _recycle_cutoff():
+    days = getattr(settings, "ACCESS_CODE_RECYCLE_AFTER_DAYS", 180)
+    return timezone.now() - timedelta(days=days)
+
+
+def _claim(candidates: list) -> list:
+    """Drop candidates held by live games; free the ones held by old games."""
+    held = dict(Game.objects.filter(access_code__in=candidates).values_list("access_code", "end_time"))
+    if not held:
+        return candidates
+
+    cutoff = _recycle_cutoff()
+    recyclable = [code for code, end_time in held.items() if end_time < cutoff]
+    if recyclable:
+        Game.objects.filter(access_code__in=recyclable).update(access_code=None)
+    return [code for code in candidates if code not in held or code in recyclable]
+
+
+def allocate_codes(count: int = 1) -> list:
+    """Reserve ``count`` distinct access codes.
+
+    Use the result for Game.objects.bulk_create(); Game.save() calls this for
+    single creates.
+    """
+    key = _key()
+    codes = []
+    walked = 0
+    with transaction.atomic():
+        while len(codes) < count:
+            need = count - len(codes)
+            if walked >= CODE_SPACE:
+                raise CodeSpaceExhausted("No free access codes left.")
+            start = _reserve(need)
+            walked += need
+            codes += _claim([code_for_index(i, key) for i in range(start, start + need)])
+    return codes
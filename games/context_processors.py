@@ -1,5 +1,12 @@
-from .models import Announcement
+from . import metrics, news, sessions
 
+@metrics.timed("cp")
 def global_news(request):
-    site_news = Announcement.objects.filter(is_active=True).order_by("-created_at")[:3]
+    site_news = news.active_announcements()[:3]
     return {"site_news": site_news}
+
+
+@metrics.timed("cp")
+def organizer(request):
+    # read from the session only when there is one (see sessions.has_session)
+    return {"is_organizer": sessions.is_organizer(request)}
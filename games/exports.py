@@ -0,0 +1,154 @@
+"""Streaming exports of registrations and activity.
+
+Rows are read with values_list().iterator() and written out one at a time,
+so memory stays flat no matter how much history is exported. Used by the
+organizer export views and the export_data management command.
+
+Under ASGI a sync iterator handed to StreamingHttpResponse is read into a
+list first, so the views wrap render() in arender() there, which reads it a
+chunk at a time on the sync thread.
+"""
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Activity, Registration
+
+CHUNK_SIZE = 2000
+FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+REGISTRATION_COLUMNS = [
+    ("id", "id"),
+    ("game_id", "game_id"),
+    ("game_code", "game__access_code"),
+    ("name", "name"),
+    ("email", "email"),
+    ("phone", "phone"),
+    ("status", "status"),
+    ("position", "position"),
+    ("created_at", "created_at"),
+]
+
+ACTIVITY_COLUMNS = [
+    ("id", "id"),
+    ("game_id", "game_id"),
+    ("registration_id", "registration_id"),
+    ("kind", "kind"),
+    ("message", "message"),
+    ("created_at", "created_at"),
+]
+
+
+def _parse_moment(value: str, end_of_range: bool):
+    """ISO date or datetime → aware datetime. A bare date as the end of a
+    range covers that whole day."""
+    try:
+        day = parse_date(value)
+        dt = None if day else parse_datetime(value)
+    except ValueError:
+        day = dt = None
+    if day:
+        dt = datetime.combine(day + timedelta(days=1) if end_of_range else day, time.min)
+    elif dt is None:
+        raise ValueError(f"Not a date: {value!r}")
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, timezone.get_current_timezone())
+    return dt
+
+
+def _filtered(qs, game=None, since=None, until=None):
+    if game:
+        if not str(game).isdigit():
+            raise ValueError(f"Not a game id: {game!r}")
+        qs = qs.filter(game_id=int(game))
+    if since:
+        qs = qs.filter(created_at__gte=_parse_moment(since, end_of_range=False))
+    if until:
+        qs = qs.filter(created_at__lt=_parse_moment(until, end_of_range=True))
+    return qs
+
+
+def registration_rows(game=None, status=None, since=None, until=None):
+    qs = _filtered(Registration.objects.all(), game, since, until)
+    if status:
+        status = status.upper()
+        if status not in Registration.Status.values:
+            raise ValueError(f"Unknown status: {status!r}")
+        qs = qs.filter(status=status)
+    fields = [field for _, field in REGISTRATION_COLUMNS]
+    return qs.order_by("id").values_list(*fields).iterator(chunk_size=CHUNK_SIZE)
+
+
+def activity_rows(game=None, kind=None, since=None, until=None):
+    qs = _filtered(Activity.objects.all(), game, since, until)
+    if kind:
+        kind = kind.upper()
+        if kind not in Activity.Kind.values:
+            raise ValueError(f"Unknown activity kind: {kind!r}")
+        qs = qs.filter(kind=kind)
+    fields = [field for _, field in ACTIVITY_COLUMNS]
+    return qs.order_by("id").values_list(*fields).iterator(chunk_size=CHUNK_SIZE)
+
+
+# Cells a spreadsheet would read as a formula. Names and emails come from
+# the public sign-up form, so CSV cells starting with one get a leading '.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_safe(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Echo:
+    """File-like object csv.writer can write to; hands each line back."""
+
+    def write(self, value):
+        return value
+
+
+def render(rows, columns, fmt: str):
+    """Yield the export line by line as text."""
+    header = [name for name, _ in columns]
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow([_csv_safe(value) for value in row])
+    elif fmt == "jsonl":
+        for row in rows:
+            yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + "\n"
+    else:
+        raise ValueError(f"Unknown format: {fmt!r}")
+
+
+def _next_chunk(lines, size):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            break
+    return chunk
+
+
+async def arender(lines, chunk_size: int = CHUNK_SIZE):
+    """Async version of a render() stream for ASGI responses.
+
+    Lines are pulled chunk_size at a time on the sync thread (the database
+    cursor lives there) and handed out as one string per chunk.
+    """
+    lines = iter(lines)
+    try:
+        while True:
+            chunk = await sync_to_async(_next_chunk)(lines, chunk_size)
+            if not chunk:
+                return
+            yield "".join(chunk)
+    finally:
+        await sync_to_async(lines.close)()
@@ -1,6 +1,6 @@
 from django import forms
 from django.utils import timezone
-from .models import Game, Announcement
+from .models import Game, Registration, Announcement
 
 
 class GameForm(forms.ModelForm):
@@ -51,3 +51,27 @@ class AnnouncementForm(forms.ModelForm):
             "message": forms.Textarea(attrs={"class": "form-control input-glass", "rows": 4}),
             "is_active": forms.CheckboxInput(attrs={"class": "form-check-input"}),
         }
+
+
+class RegistrationAdminForm(forms.ModelForm):
+    """Admin form that checks per-game email uniqueness the way the database does.
+
+    The unique constraint is on the derived email_normalized column, which the
+    form never sees, so a case-only duplicate would otherwise reach the insert.
+    """
+
+    class Meta:
+        model = Registration
+        fields = "__all__"
+
+    def clean(self):
+        cleaned = super().clean()
+        game = cleaned.get("game") or (self.instance.game if self.instance.game_id else None)
+        email = cleaned.get("email")
+        if game and email:
+            taken = Registration.objects.filter(
+                game=game, email_normalized=Registration.normalize_email(email),
+            ).exclude(pk=self.instance.pk)
+            if taken.exists():
+                self.add_error("email", "This email is already registered for this game.")
+        return cleaned
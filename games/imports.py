@@ -0,0 +1,107 @@
+"""Bulk CSV import of registrations into one game.
+
+The CSV needs name, email and phone columns (header names are
+case-insensitive). Rows are validated and de-duplicated up front, then
+written with bulk_create under the game lock, after checking the emails
+again for sign-ups that arrived meanwhile: open spots are filled in file
+order and the rest go on the waitlist.
+"""
+import csv
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from . import roster
+from .models import Activity, Game, Registration
+
+REQUIRED_COLUMNS = ["name", "email", "phone"]
+BATCH_SIZE = 500
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = []  # validated (line_no, name, email, phone)
+        self.errors = []  # (line_no, message)
+        self.confirmed = 0
+        self.waitlisted = 0
+
+    @property
+    def created(self):
+        return self.confirmed + self.waitlisted
+
+
+def _validate(game: Game, lines, result: ImportResult) -> None:
+    reader = csv.DictReader(lines)
+    columns = {(c or "").strip().lower(): c for c in reader.fieldnames or []}
+    missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+    if missing:
+        result.errors.append((1, f"Missing column(s): {', '.join(missing)}"))
+        return
+
+    # one query for everything already on this game
+    seen = set(game.registrations.values_list("email_normalized", flat=True))
+
+    for line_no, raw in enumerate(reader, start=2):
+        name, email, phone = ((raw.get(columns[c]) or "").strip() for c in REQUIRED_COLUMNS)
+        if not name or not email or not phone:
+            result.errors.append((line_no, "name, email and phone are required"))
+            continue
+        try:
+            validate_email(email)
+        except ValidationError:
+            result.errors.append((line_no, f"invalid email {email!r}"))
+            continue
+        if not Registration.digits(phone):
+            result.errors.append((line_no, f"phone {phone!r} has no digits"))
+            continue
+        if Registration.normalize_email(email) in seen:
+            result.errors.append((line_no, f"{email} is already registered for this game"))
+            continue
+        seen.add(Registration.normalize_email(email))
+        result.rows.append((line_no, name, email, phone))
+
+
+def import_registrations(game: Game, lines, dry_run: bool = False, batch_size: int = BATCH_SIZE) -> ImportResult:
+    """Validate ``lines`` (an iterable of CSV text lines) and import them."""
+    result = ImportResult()
+    _validate(game, lines, result)
+    if dry_run or not result.rows:
+        return result
+
+    with roster.locked_game(game.pk) as locked:
+        # sign-ups that arrived since _validate() looked
+        taken = set(locked.registrations.values_list("email_normalized", flat=True))
+        rows = []
+        for line_no, name, email, phone in result.rows:
+            if Registration.normalize_email(email) in taken:
+                result.errors.append((line_no, f"{email} is already registered for this game"))
+            else:
+                rows.append((line_no, name, email, phone))
+        result.rows = rows
+        result.errors.sort()
+
+        open_spots = max(locked.capacity - locked.confirmed_count, 0)
+        regs = []
+        for i, (_, name, email, phone) in enumerate(result.rows):
+            if i < open_spots:
+                status, position = Registration.Status.CONFIRMED, locked.confirmed_count + i + 1
+            else:
+                status, position = Registration.Status.WAITLIST, locked.waitlist_count + i - open_spots + 1
+            regs.append(Registration(
+                game=locked, name=name, email=email, phone=phone, status=status, position=position,
+            ).fill_derived())
+
+        Registration.objects.bulk_create(regs, batch_size=batch_size)
+        Activity.objects.bulk_create([
+            Activity(game=locked, registration=reg, kind=Activity.Kind.APPROVED,
+                     message=f"Imported ({reg.status}): {reg.name}")
+            for reg in regs
+        ], batch_size=batch_size)
+
+        result.confirmed = min(open_spots, len(regs))
+        result.waitlisted = len(regs) - result.confirmed
+        roster.count_change(locked, Registration.Status.CONFIRMED, result.confirmed)
+        roster.count_change(locked, Registration.Status.WAITLIST, result.waitlisted)
+        roster.recalc_positions(locked)
+
+    return result
@@ -0,0 +1,214 @@
+"""Buffered registration intake for sign-up storms.
+
+With settings.REGISTRATION_INTAKE = "buffered", game_detail doesn't write
+a sign-up itself. It queues the request, stamped with its arrival time,
+and answers straight away. A background thread per worker collects queued
+requests for up to INTAKE_FLUSH_SECONDS (or INTAKE_BATCH_SIZE of them) and
+writes each batch in one transaction: per game, one lookup for
+already-registered emails, then bulk inserts of registrations and their
+activity rows in arrival order, and one counter update. Registration.created_at
+is the arrival time, so the pending queue stays first come, first served
+however the batches fall.
+
+Each request's outcome (queued / registered / duplicate / closed / failed) is kept
+in the cache under the game code + email, where the player portal reads it.
+With several workers, set CACHE_DIR so the portal sees outcomes written by
+other workers. A batch that fails for any other reason than a duplicate
+(e.g. "database is locked" after the busy timeout) goes back on the queue,
+up to MAX_ATTEMPTS times; after that its requests are marked failed and the
+portal asks the player to sign up again. Requests still queued when a
+worker exits are flushed at exit; a worker that is killed outright loses
+them.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, close_old_connections
+from django.utils import timezone
+
+from . import roster
+from .models import Activity, Game, Registration
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+REGISTERED = "registered"
+DUPLICATE = "duplicate"
+CLOSED = "closed"
+FAILED = "failed"
+
+OUTCOME_TIMEOUT = 60 * 60
+MAX_ATTEMPTS = 3
+
+
+Pending = namedtuple("Pending", "game_id code name email phone arrived_at attempts", defaults=[0])
+
+
+_queue = queue.Queue()
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return getattr(settings, "REGISTRATION_INTAKE", "direct") == "buffered"
+
+
+def _outcome_key(code: str, email: str) -> str:
+    return f"intake:{code}:{Registration.normalize_email(email)}"
+
+
+def outcome(code: str, email: str):
+    """{"status": ..., "at": iso arrival time} for the latest request, or None."""
+    return cache.get(_outcome_key(code, email))
+
+
+def _set_outcome(item: Pending, status: str) -> None:
+    cache.set(_outcome_key(item.code, item.email),
+              {"status": status, "at": item.arrived_at.isoformat()}, OUTCOME_TIMEOUT)
+
+
+def submit(game: Game, name: str, email: str, phone: str) -> None:
+    """Queue a sign-up for ``game``; it is written by the flusher thread."""
+    item = Pending(game.pk, game.access_code, name, email, phone, timezone.now())
+    _set_outcome(item, QUEUED)
+    _queue.put(item)
+    _start_flusher()
+
+
+def _start_flusher() -> None:
+    global _flusher
+    if _flusher is not None:
+        return
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_run, name="registration-intake", daemon=True)
+            _flusher.start()
+            atexit.register(flush)
+
+
+def _run() -> None:
+    while True:
+        batch = [_queue.get()]
+        deadline = time.monotonic() + settings.INTAKE_FLUSH_SECONDS
+        while len(batch) < settings.INTAKE_BATCH_SIZE:
+            try:
+                batch.append(_queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        try:
+            write(batch)
+        except Exception:
+            # write() retries failed batches itself; this keeps the thread alive
+            logger.exception("Registration intake batch of %d failed", len(batch))
+        finally:
+            close_old_connections()
+
+
+def flush() -> int:
+    """Write everything queued so far from the calling thread.
+
+    Returns how many requests were written; a retried one counts once.
+    """
+    written = 0
+    while True:
+        batch = []
+        while True:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return written
+        # retried requests come back on the queue, hence the outer loop
+        for start in range(0, len(batch), settings.INTAKE_BATCH_SIZE):
+            write(batch[start:start + settings.INTAKE_BATCH_SIZE])
+        written += sum(1 for item in batch if not item.attempts)
+
+
+def write(batch: list) -> None:
+    """Insert a batch in one transaction, falling back to one at a time.
+
+    The fallback only runs when the batch collides with a write made
+    elsewhere (another worker, or the organizer) since it was checked.
+    Any other failure puts the batch back on the queue (see _retry).
+    """
+    try:
+        outcomes = _write(batch)
+    except IntegrityError:
+        outcomes = []
+        for item in batch:
+            try:
+                outcomes += _write([item])
+            except IntegrityError:
+                outcomes.append((item, DUPLICATE))
+            except Exception:
+                logger.exception("Registration intake failed for one request")
+                _retry([item])
+    except Exception:
+        logger.exception("Registration intake batch of %d failed", len(batch))
+        _retry(batch)
+        return
+    for item, status in outcomes:
+        _set_outcome(item, status)
+
+
+def _retry(items: list) -> None:
+    for item in items:
+        if item.attempts + 1 < MAX_ATTEMPTS:
+            _queue.put(item._replace(attempts=item.attempts + 1))
+        else:
+            _set_outcome(item, FAILED)
+
+
+def _write(batch: list) -> list:
+    by_game = {}
+    for item in batch:
+        by_game.setdefault(item.game_id, []).append(item)
+    open_games = set(
+        Game.objects.filter(pk__in=by_game, end_time__gte=timezone.now()).values_list("pk", flat=True)
+    )
+
+    outcomes = []
+    with roster.locked_games(open_games) as games:
+        for game_id in sorted(by_game):
+            items = sorted(by_game[game_id], key=lambda item: item.arrived_at)
+            if game_id in games:
+                outcomes += _write_game(games[game_id], items)
+            else:
+                outcomes += [(item, CLOSED) for item in items]
+    return outcomes
+
+
+def _write_game(game: Game, items: list) -> list:
+    taken = set(
+        game.registrations.filter(
+            email_normalized__in=[Registration.normalize_email(item.email) for item in items]
+        ).values_list("email_normalized", flat=True)
+    )
+    outcomes, regs = [], []
+    for item in items:
+        email = Registration.normalize_email(item.email)
+        if email in taken:
+            outcomes.append((item, DUPLICATE))
+            continue
+        taken.add(email)
+        outcomes.append((item, REGISTERED))
+        regs.append(Registration(
+            game=game, name=item.name, email=item.email, phone=item.phone,
+            status=Registration.Status.PENDING, created_at=item.arrived_at,
+        ).fill_derived())
+
+    Registration.objects.bulk_create(regs)
+    Activity.objects.bulk_create([
+        Activity(game=game, registration=reg, kind=Activity.Kind.REQUESTED,
+                 message=f"New request: {reg.name} ({reg.email})")
+        for reg in regs
+    ])
+    roster.count_change(game, Registration.Status.PENDING, len(regs))
+    return outcomes
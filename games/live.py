@@ -0,0 +1,127 @@
+"""Live roster updates pushed to game pages over Server-Sent Events.
+
+Roster transitions call roster_changed() once their transaction commits. The
+broadcaster hands a snapshot of the public roster to every SSE connection
+subscribed to that game. Fan-out goes through a pluggable backend
+(settings.LIVE_ROSTER_BACKEND). The default InProcessBackend only reaches
+subscribers in the same process, so run the app under one ASGI worker, or
+plug in a backend that relays through a broker.
+"""
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .models import Game
+
+# Per-connection buffer. Each message is a full snapshot, so when a slow
+# client falls behind we drop its oldest message rather than block publishers.
+QUEUE_SIZE = 8
+
+# Comment line sent when idle so proxies don't drop the connection.
+KEEPALIVE_SECONDS = 25
+
+
+class InProcessBackend:
+    """Fan-out to asyncio queues of subscribers living in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # channel -> set of (loop, queue)
+
+    def has_subscribers(self, channel: str) -> bool:
+        return bool(self._subscribers.get(channel))
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(QUEUE_SIZE))
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                subs = self._subscribers.get(channel)
+                if subs is not None:
+                    subs.discard(entry)
+                    if not subs:
+                        del self._subscribers[channel]
+
+    def publish(self, channel: str, message) -> None:
+        # Safe to call from any thread: delivery is scheduled on each
+        # subscriber's own event loop.
+        with self._lock:
+            subs = list(self._subscribers.get(channel, ()))
+        for loop, queue in subs:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, message)
+            except RuntimeError:
+                pass  # loop already closed; its subscription is going away
+
+
+def _offer(queue: asyncio.Queue, message) -> None:
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, "LIVE_ROSTER_BACKEND", "games.live.InProcessBackend")
+                _backend = import_string(path)()
+    return _backend
+
+
+def channel_for(game_id: int) -> str:
+    return f"game:{game_id}"
+
+
+def roster_snapshot(game) -> dict:
+    from .roster import public_roster
+
+    lists = public_roster(game)
+    return {
+        "version": game.roster_version,
+        "capacity": game.capacity,
+        "confirmed_count": game.confirmed_count,
+        "waitlist_count": game.waitlist_count,
+        "pending_count": game.pending_count,
+        "confirmed": [r["name"] for r in lists["confirmed"]],
+        "waitlist": [r["name"] for r in lists["waitlist"]],
+    }
+
+
+def roster_changed(game_id: int) -> None:
+    """Push the current roster of ``game_id`` to its subscribers, if any."""
+    backend = get_backend()
+    channel = channel_for(game_id)
+    if not backend.has_subscribers(channel):
+        return
+    game = Game.objects.filter(pk=game_id).first()
+    if game is not None:
+        backend.publish(channel, roster_snapshot(game))
+
+
+async def roster_events(game):
+    """SSE stream for one game: the current roster, then every change."""
+    async with get_backend().subscribe(channel_for(game.pk)) as queue:
+        snapshot = await sync_to_async(roster_snapshot)(game)
+        yield f"retry: 5000\nevent: roster\ndata: {json.dumps(snapshot)}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: roster\ndata: {json.dumps(message)}\n\n"
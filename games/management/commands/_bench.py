@@ -0,0 +1,5 @@
+"""Helpers shared by the benchmark commands and the query-budget tests."""
+
+
+class Rollback(Exception):
+    """Raised inside transaction.atomic() to undo a measured run's writes."""
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from games import archive
+
+
+class Command(BaseCommand):
+    help = "Move Activity rows older than the retention window into gzipped JSONL archives."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=settings.ACTIVITY_RETENTION_DAYS,
+            help="Archive activity older than this many days.",
+        )
+        parser.add_argument("--batch-size", type=int, default=archive.CHUNK_SIZE)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived.")
+
+    def handle(self, *args, **opts):
+        moved = archive.archive_older_than(
+            opts["days"], chunk_size=opts["batch_size"], pause=opts["pause"], dry_run=opts["dry_run"],
+        )
+        if opts["dry_run"]:
+            self.stdout.write(f"{moved} activity row(s) older than {opts['days']} day(s) would be archived.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Archived {moved} activity row(s) to {archive.archive_dir()}."))
@@ -0,0 +1,77 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from games import roster
+from games.management.commands._bench import Rollback
+from games.models import Game, Registration
+
+
+def _per_row_renumber(game):
+    """The old loop: one UPDATE per row whose position changed."""
+    for status in [Registration.Status.CONFIRMED, Registration.Status.WAITLIST]:
+        regs = game.registrations.filter(status=status).order_by("created_at")
+        for i, r in enumerate(regs, start=1):
+            if r.position != i:
+                r.position = i
+                r.save(update_fields=["position"])
+
+
+class Command(BaseCommand):
+    help = "Benchmark roster renumbering (queries + wall time) after removing the #1 waitlisted player."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="20,200,2000", help="Comma-separated waitlist sizes.")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        sizes = [int(s) for s in opts["sizes"].split(",") if s.strip()]
+
+        self.stdout.write(f"{'size':>6}  {'impl':<10} {'queries':>8} {'ms (best)':>10}")
+        for size in sizes:
+            for label, fn in [("per-row", _per_row_renumber), ("set-based", roster.recalc_positions)]:
+                queries, best = self._measure(size, fn, opts["repeat"])
+                self.stdout.write(f"{size:>6}  {label:<10} {queries:>8} {best * 1000:>10.2f}")
+
+    def _measure(self, size, fn, repeat):
+        best = None
+        queries = 0
+        for _ in range(repeat):
+            # Everything happens in a transaction that is rolled back, so the
+            # benchmark never leaves rows behind.
+            try:
+                with transaction.atomic():
+                    game = self._seed(size)
+                    reset_queries()
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = time.perf_counter()
+                        fn(game)
+                        elapsed = time.perf_counter() - start
+                    queries = len(ctx.captured_queries)
+                    best = elapsed if best is None else min(best, elapsed)
+                    raise Rollback
+            except Rollback:
+                pass
+        return queries, best
+
+    def _seed(self, size):
+        now = timezone.now()
+        game = Game.objects.create(
+            title="bench", start_time=now + timedelta(days=1), end_time=now + timedelta(days=1, hours=2), capacity=0,
+        )
+        Registration.objects.bulk_create([
+            Registration(
+                game=game, name=f"p{i}", email=f"p{i}@bench.local", phone="5550000000",
+                status=Registration.Status.WAITLIST, position=i + 1,
+            ).fill_derived()
+            for i in range(size)
+        ])
+        first = game.registrations.order_by("created_at", "id").first()
+        first.status = Registration.Status.CANCELLED
+        first.position = None
+        first.save(update_fields=["status", "position"])
+        return game
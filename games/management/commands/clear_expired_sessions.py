@@ -0,0 +1,32 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions in small batches, so SQLite's write lock is never held for long. "
+        "Meant to run from cron, e.g. hourly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+
+    def handle(self, *args, **opts):
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+        deleted = 0
+        while True:
+            keys = list(expired.values_list("session_key", flat=True)[:opts["batch_size"]])
+            if not keys:
+                break
+            with transaction.atomic():
+                Session.objects.filter(session_key__in=keys).delete()
+            deleted += len(keys)
+            if opts["pause"]:
+                time.sleep(opts["pause"])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired session(s)."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from games import exports
+
+
+class Command(BaseCommand):
+    help = "Stream registrations or activity out as CSV or JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("what", choices=["registrations", "activity"])
+        parser.add_argument("--format", choices=sorted(exports.FORMATS), default="csv")
+        parser.add_argument("--game", help="Game id.")
+        parser.add_argument("--status", help="Registration status (or activity kind).")
+        parser.add_argument("--since", help="ISO date/datetime, inclusive.")
+        parser.add_argument("--until", help="ISO date/datetime; a bare date includes that day.")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout).")
+
+    def handle(self, *args, **opts):
+        if opts["what"] == "registrations":
+            rows_func, columns, filter_key = exports.registration_rows, exports.REGISTRATION_COLUMNS, "status"
+        else:
+            rows_func, columns, filter_key = exports.activity_rows, exports.ACTIVITY_COLUMNS, "kind"
+
+        try:
+            rows = rows_func(
+                game=opts["game"], since=opts["since"], until=opts["until"],
+                **{filter_key: opts["status"]},
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        out = open(opts["output"], "w", newline="", encoding="utf-8") if opts["output"] else self.stdout
+        try:
+            for line in exports.render(rows, columns, opts["format"]):
+                out.write(line)
+        finally:
+            if out is not self.stdout:
+                out.close()
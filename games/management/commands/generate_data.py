@@ -0,0 +1,127 @@
+import random
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from games.codes import allocate_codes
+from games.models import Activity, Game, Registration
+
+GAMES_PER_CHUNK = 100
+CAPACITIES = [10, 12, 14, 16, 18, 22]
+LOCATIONS = ["Riverside Park", "Eastside Courts", "Northgate Field", "Harbor Gym", "Central Turf"]
+# share of each game's registrations that are not confirmed/waitlisted
+OTHER_STATUSES = [
+    (Registration.Status.PENDING, 0.15),
+    (Registration.Status.DENIED, 0.05),
+    (Registration.Status.CANCELLED, 0.07),
+    (Registration.Status.REMOVED, 0.03),
+]
+
+
+def _spread(total: int, parts: int, index: int) -> int:
+    return total // parts + (1 if index < total % parts else 0)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate a synthetic dataset (games, registrations, activity) for benchmarking. "
+        "The same --seed and --anchor give the same rows; access codes also match when run on an empty database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=5000)
+        parser.add_argument("--registrations", type=int, default=500_000, help="Total, spread evenly over games.")
+        parser.add_argument("--activity", type=int, default=2_000_000, help="Total, spread evenly over games.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--anchor", help="Day game times are laid out around (YYYY-MM-DD). Default: today.")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Rows per INSERT.")
+
+    def handle(self, *args, **opts):
+        if opts["games"] < 1:
+            raise CommandError("--games must be at least 1.")
+        try:
+            day = datetime.strptime(opts["anchor"], "%Y-%m-%d").date() if opts["anchor"] else timezone.localdate()
+        except ValueError:
+            raise CommandError(f"Not a date: {opts['anchor']!r}")
+        self.anchor = timezone.make_aware(datetime.combine(day, time(18)))
+        self.rng = random.Random(opts["seed"])
+        self.opts = opts
+
+        totals = {"games": 0, "registrations": 0, "activity": 0}
+        for start in range(0, opts["games"], GAMES_PER_CHUNK):
+            count = min(GAMES_PER_CHUNK, opts["games"] - start)
+            with transaction.atomic():
+                made = self._chunk(start, count)
+            for key, n in made.items():
+                totals[key] += n
+            self.stdout.write(f"  {start + count}/{opts['games']} games")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {totals['games']} games, {totals['registrations']} registrations, "
+            f"{totals['activity']} activity rows."
+        ))
+
+    def _chunk(self, start: int, count: int) -> dict:
+        rng, opts = self.rng, self.opts
+        games, regs_by_game = [], []
+        for gi, code in zip(range(start, start + count), allocate_codes(count)):
+            kickoff = self.anchor + timedelta(days=rng.randint(-180, 60), hours=rng.choice([-2, 0, 1, 2]))
+            game = Game(
+                title=f"Pickup #{gi + 1}", location=rng.choice(LOCATIONS), capacity=rng.choice(CAPACITIES),
+                start_time=kickoff, end_time=kickoff + timedelta(hours=2), access_code=code,
+            )
+            regs_by_game.append(self._registrations(game, gi, _spread(opts["registrations"], opts["games"], gi)))
+            games.append(game)
+
+        Game.objects.bulk_create(games, batch_size=opts["batch_size"])
+        regs = []
+        for game, game_regs in zip(games, regs_by_game):
+            for reg in game_regs:
+                reg.game = game
+            regs += game_regs
+        Registration.objects.bulk_create(regs, batch_size=opts["batch_size"])
+
+        activity = []
+        kinds = Activity.Kind.values
+        for gi, (game, game_regs) in enumerate(zip(games, regs_by_game), start=start):
+            for _ in range(_spread(opts["activity"], opts["games"], gi)):
+                reg = rng.choice(game_regs) if game_regs else None
+                kind = rng.choice(kinds)
+                activity.append(Activity(
+                    game=game, registration=reg, kind=kind,
+                    message=f"{kind.title()}: {reg.name if reg else game.title}",
+                ))
+        Activity.objects.bulk_create(activity, batch_size=opts["batch_size"])
+        return {"games": len(games), "registrations": len(regs), "activity": len(activity)}
+
+    def _registrations(self, game: Game, gi: int, n: int) -> list:
+        """Unsaved registrations for ``game``; also fills its roster counters."""
+        rng = self.rng
+        regs = []
+        for i in range(n):
+            roll, status = rng.random(), None
+            for other, share in OTHER_STATUSES:
+                if roll < share:
+                    status = other
+                    break
+                roll -= share
+
+            position = None
+            if status is None:
+                if game.confirmed_count < game.capacity:
+                    status, game.confirmed_count = Registration.Status.CONFIRMED, game.confirmed_count + 1
+                    position = game.confirmed_count
+                else:
+                    status, game.waitlist_count = Registration.Status.WAITLIST, game.waitlist_count + 1
+                    position = game.waitlist_count
+            elif status == Registration.Status.PENDING:
+                game.pending_count += 1
+
+            phone = f"555{rng.randrange(10 ** 7):07d}"
+            email = f"p{gi}-{i}@example.test"
+            regs.append(Registration(
+                name=f"Player {gi}-{i}", email=email, phone=phone, status=status, position=position,
+            ).fill_derived())
+        return regs
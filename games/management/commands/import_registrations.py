@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from games import imports
+from games.models import Game
+
+
+class Command(BaseCommand):
+    help = "Import registrations for one game from a CSV file (name, email, phone)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("game", help="Game id or access code.")
+        parser.add_argument("csv_path")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only.")
+        parser.add_argument("--batch-size", type=int, default=imports.BATCH_SIZE)
+
+    def handle(self, *args, **opts):
+        ref = opts["game"]
+        game = Game.objects.filter(access_code=ref).first() if len(ref) == 5 else None
+        if game is None and ref.isdigit():
+            game = Game.objects.filter(id=int(ref)).first()
+        if game is None:
+            raise CommandError(f"No game {ref!r}.")
+
+        with open(opts["csv_path"], encoding="utf-8-sig", newline="") as f:
+            try:
+                result = imports.import_registrations(
+                    game, f, dry_run=opts["dry_run"], batch_size=opts["batch_size"],
+                )
+            except IntegrityError:
+                # a sign-up for one of the emails landed mid-import; nothing was written
+                raise CommandError("Someone signed up with one of these emails during the import. Please try again.")
+
+        for line_no, error in result.errors:
+            self.stderr.write(f"line {line_no}: {error}")
+
+        if opts["dry_run"]:
+            self.stdout.write(f"{len(result.rows)} valid row(s), {len(result.errors)} error(s). Nothing written.")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Imported {result.created} into {game}: {result.confirmed} confirmed, "
+                f"{result.waitlisted} waitlisted; {len(result.errors)} row error(s)."
+            ))
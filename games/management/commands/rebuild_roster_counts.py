@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from games.models import Game, Registration
+from games.roster import COUNTER_FIELDS, locked_game
+
+
+class Command(BaseCommand):
+    help = "Recount confirmed/waitlist/pending for every game, report drift and fix it."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report drift, don't write.")
+        parser.add_argument("--game", type=int, help="Limit to one game id.")
+
+    def handle(self, *args, **opts):
+        games = Game.objects.annotate(**{
+            f"actual_{field}": Count("registrations", filter=Q(registrations__status=status))
+            for status, field in COUNTER_FIELDS.items()
+        }).order_by("id")
+        if opts["game"]:
+            games = games.filter(id=opts["game"])
+
+        checked = drifted = 0
+        for game in games.iterator():
+            checked += 1
+            drift = {
+                field: (getattr(game, field), getattr(game, f"actual_{field}"))
+                for field in COUNTER_FIELDS.values()
+                if getattr(game, field) != getattr(game, f"actual_{field}")
+            }
+            if not drift:
+                continue
+
+            drifted += 1
+            detail = ", ".join(f"{field} {stored}→{actual}" for field, (stored, actual) in drift.items())
+            self.stdout.write(f"Game {game.id} ({game.access_code}): {detail}")
+
+            if not opts["dry_run"]:
+                self._fix(game.id)
+
+        verb = "found" if opts["dry_run"] else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} game(s), {verb} drift on {drifted}."))
+
+    def _fix(self, game_id):
+        # recount under the game lock so a concurrent transition can't slip in
+        # between counting and writing
+        with locked_game(game_id) as game:
+            counts = dict(
+                Registration.objects.filter(game_id=game_id, status__in=list(COUNTER_FIELDS))
+                .values_list("status").annotate(n=Count("id"))
+            )
+            for status, field in COUNTER_FIELDS.items():
+                setattr(game, field, counts.get(status, 0))
+            game.save(update_fields=list(COUNTER_FIELDS.values()))
@@ -0,0 +1,226 @@
+import json
+import math
+import platform
+import random
+import time
+import tracemalloc
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from games import sessions
+from games.management.commands._bench import Rollback
+from games.models import Activity, Game, Registration
+
+SAMPLE_SIZE = 2000
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the main views through the test client against the current database and report "
+        "p50/p95/p99 latency, queries per request and peak memory. Every request runs in a "
+        "transaction that is rolled back, so the data is left as it was."
+    )
+
+    SCENARIOS = ["game_detail", "dashboard", "manage_game", "approve_registration", "player_cancel", "player_portal_login"]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--memory-samples", type=int, default=10,
+                            help="Extra requests per scenario run under tracemalloc for peak memory.")
+        parser.add_argument("--only", help=f"Comma-separated subset of: {', '.join(self.SCENARIOS)}.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--label", default="", help="Free-form name stored in the results.")
+        parser.add_argument("--output", help="Write results as JSON to this file.")
+        parser.add_argument("--compare", help="Earlier results JSON to show p95 changes against.")
+
+    def handle(self, *args, **opts):
+        names = self.SCENARIOS
+        if opts["only"]:
+            names = [n.strip() for n in opts["only"].split(",") if n.strip()]
+            unknown = set(names) - set(self.SCENARIOS)
+            if unknown:
+                raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        self.rng = random.Random(opts["seed"])
+        self._load_samples()
+
+        # let the test client's host through; throttling would turn repeated logins into 429s
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], THROTTLE_RATES={}):
+            results = {name: self._run(name, opts) for name in names}
+
+        report = {
+            "label": opts["label"],
+            "started_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "dataset": {
+                "games": Game.objects.count(),
+                "registrations": Registration.objects.count(),
+                "activity": Activity.objects.count(),
+            },
+            "requests": opts["requests"],
+            "results": results,
+        }
+        previous = self._previous(opts["compare"])
+        self._print(report, previous)
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Results written to {opts['output']}")
+
+    # -- data ---------------------------------------------------------------
+
+    def _load_samples(self):
+        """Pick the rows each scenario runs against, once, up front."""
+        now = timezone.now()
+        upcoming = list(
+            Game.objects.filter(end_time__gte=now).exclude(access_code=None)
+            .values_list("id", "access_code")[:SAMPLE_SIZE]
+        )
+        if not upcoming:
+            raise CommandError("No upcoming games. Run generate_data first.")
+        upcoming_ids = [game_id for game_id, _ in upcoming]
+
+        def regs(status):
+            return list(
+                Registration.objects.filter(game_id__in=upcoming_ids[:500], status=status)
+                .values_list("id", "game__access_code", "email", "phone_digits")[:SAMPLE_SIZE]
+            )
+
+        self.games = upcoming
+        self.pending = regs(Registration.Status.PENDING)
+        self.confirmed = regs(Registration.Status.CONFIRMED)
+
+    # -- scenarios ----------------------------------------------------------
+
+    def _prepare(self, name, client):
+        """Return (method, url, data) for one request of scenario ``name``."""
+        rng = self.rng
+        if name == "game_detail":
+            _, code = rng.choice(self.games)
+            return "get", reverse("games:game_detail", args=[code]), None
+        if name == "dashboard":
+            return "get", reverse("games:dashboard"), None
+        if name == "manage_game":
+            game_id, _ = rng.choice(self.games)
+            return "get", reverse("games:manage_game", args=[game_id]), None
+        if name == "approve_registration":
+            reg_id, *_ = self._pick(self.pending, name)
+            return "get", reverse("games:approve_registration", args=[reg_id]), None
+        if name == "player_cancel":
+            reg_id, code, *_ = self._pick(self.confirmed, name)
+            session = client.session
+            session[sessions.PLAYERS_KEY] = {code: [reg_id, int(time.time()) + 3600]}
+            session.save()
+            return "post", reverse("games:player_cancel", args=[code]), {}
+        if name == "player_portal_login":
+            _, code, email, digits = self._pick(self.confirmed, name)
+            return "post", reverse("games:player_portal_login", args=[code]), {"email": email, "password": digits}
+        raise CommandError(f"Unknown scenario: {name}")
+
+    def _pick(self, rows, name):
+        if not rows:
+            raise CommandError(f"No registrations to run {name} against.")
+        return self.rng.choice(rows)
+
+    def _request(self, name, client, trace=False):
+        """One request, rolled back. Returns (seconds, queries, status, peak bytes)."""
+        peak = None
+        try:
+            with transaction.atomic():
+                method, url, data = self._prepare(name, client)
+                reset_queries()
+                with CaptureQueriesContext(connection) as ctx:
+                    if trace:
+                        tracemalloc.reset_peak()
+                    start = time.perf_counter()
+                    resp = getattr(client, method)(url, data)
+                    elapsed = time.perf_counter() - start
+                    if trace:
+                        peak = tracemalloc.get_traced_memory()[1]
+                raise Rollback
+        except Rollback:
+            pass
+        return elapsed, len(ctx.captured_queries), resp.status_code, peak
+
+    def _run(self, name, opts):
+        client = Client()
+        session = client.session
+        session["is_organizer"] = True
+        session.save()
+
+        for _ in range(opts["warmup"]):
+            self._request(name, client)
+
+        timings, queries, statuses = [], [], Counter()
+        for _ in range(opts["requests"]):
+            elapsed, n_queries, status, _ = self._request(name, client)
+            timings.append(elapsed * 1000)
+            queries.append(n_queries)
+            statuses[status] += 1
+
+        peaks = []
+        if opts["memory_samples"]:
+            tracemalloc.start()
+            try:
+                for _ in range(opts["memory_samples"]):
+                    peaks.append(self._request(name, client, trace=True)[3])
+            finally:
+                tracemalloc.stop()
+
+        client.logout()
+        timings.sort()
+        return {
+            "n": len(timings),
+            "p50_ms": _percentile(timings, 50),
+            "p95_ms": _percentile(timings, 95),
+            "p99_ms": _percentile(timings, 99),
+            "mean_ms": sum(timings) / len(timings) if timings else None,
+            "queries_min": min(queries, default=None),
+            "queries_max": max(queries, default=None),
+            "peak_kib": max(peaks) / 1024 if peaks else None,
+            "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        }
+
+    # -- output -------------------------------------------------------------
+
+    def _previous(self, path):
+        if not path:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f).get("results", {})
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Can't read {path}: {e}")
+
+    def _print(self, report, previous):
+        ds = report["dataset"]
+        self.stdout.write(f"{ds['games']} games, {ds['registrations']} registrations, {ds['activity']} activity rows")
+        header = f"{'scenario':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>9} {'peak KiB':>9}  status"
+        if previous is not None:
+            header += "  p95 vs prev"
+        self.stdout.write(header)
+        for name, r in report["results"].items():
+            queries = f"{r['queries_min']}" if r["queries_min"] == r["queries_max"] else f"{r['queries_min']}-{r['queries_max']}"
+            peak = f"{r['peak_kib']:.0f}" if r["peak_kib"] is not None else "-"
+            statuses = ",".join(f"{code}x{n}" for code, n in r["status_codes"].items())
+            line = f"{name:<22} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {queries:>9} {peak:>9}  {statuses}"
+            before = (previous or {}).get(name)
+            if before and before.get("p95_ms"):
+                line += f"  {(r['p95_ms'] / before['p95_ms'] - 1) * 100:+.1f}%"
+            self.stdout.write(line)
@@ -0,0 +1,38 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from games import archive
+
+
+class Command(BaseCommand):
+    help = "Search archived activity (JSONL output, oldest first)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("text", nargs="?", help="Case-insensitive text to find in the message.")
+        parser.add_argument("--game", type=int, help="Game id.")
+        parser.add_argument("--code", help="Game access code at the time of the activity.")
+        parser.add_argument("--kind", help="Activity kind, e.g. APPROVED.")
+        parser.add_argument("--since", help="First day (YYYY-MM-DD).")
+        parser.add_argument("--until", help="Last day (YYYY-MM-DD), inclusive.")
+        parser.add_argument("--limit", type=int, help="Stop after this many matches.")
+
+    def handle(self, *args, **opts):
+        days = {}
+        for key in ["since", "until"]:
+            if opts[key]:
+                try:
+                    days[key] = parse_date(opts[key])
+                except ValueError:  # well formed but not a real day, e.g. 2026-13-45
+                    days[key] = None
+                if days[key] is None:
+                    raise CommandError(f"--{key} must be YYYY-MM-DD")
+
+        matches = archive.search(
+            text=opts["text"], game_id=opts["game"], game_code=opts["code"], kind=opts["kind"], **days,
+        )
+        for n, row in enumerate(matches, start=1):
+            self.stdout.write(json.dumps(row))
+            if opts["limit"] and n >= opts["limit"]:
+                break
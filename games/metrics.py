@@ -0,0 +1,247 @@
+"""Per-request timing: Server-Timing headers and per-view Prometheus metrics.
+
+TimingMiddleware measures each request's total time and, through a
+connection execute_wrapper, its DB queries and DB time. The template
+backend below adds template render time, and context processors wrapped
+with @timed("cp") add their own time. Each response gets a Server-Timing
+header, and totals are added to in-process histograms per view name.
+metrics_text() renders those in Prometheus text format for the organizer
+metrics page. The histograms are per process, so each worker reports its
+own.
+
+Phases overlap: tpl includes context processors and any queries run while
+rendering, and every phase is part of total.
+
+Per request the cost is a few perf_counter() calls, one contextvar and one
+short lock when recording.
+"""
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+from . import throttle
+
+# upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASES = ("db", "tpl", "cp")
+
+_current = ContextVar("request_timing", default=None)
+
+
+class RequestTiming:
+    __slots__ = ("queries", "db", "tpl", "cp", "_tpl_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = self.tpl = self.cp = 0.0
+        self._tpl_depth = 0
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "n")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.n += 1
+
+
+_lock = threading.Lock()
+_views = {}  # view name -> {"total" | phase: Histogram, "queries": int}
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.db += time.perf_counter() - start
+        timing.queries += 1
+
+
+def timed(phase: str):
+    """Add the wrapped function's run time to the current request's ``phase``."""
+    def decorator(func):
+        @wraps(func)
+        def _wrapped(*args, **kwargs):
+            timing = _current.get()
+            if timing is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                setattr(timing, phase, getattr(timing, phase) + time.perf_counter() - start)
+        return _wrapped
+    return decorator
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timing = _current.get()
+        if timing is None:
+            return super().render(context, request)
+        # only the outermost render counts; nested render_to_string is inside it
+        timing._tpl_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timing._tpl_depth -= 1
+            if not timing._tpl_depth:
+                timing.tpl += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates whose templates report render time to TimingMiddleware."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+def _view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else "<unmatched>"
+
+
+def record(view: str, total: float, timing: RequestTiming) -> None:
+    with _lock:
+        stats = _views.get(view)
+        if stats is None:
+            stats = _views[view] = {"total": Histogram(), "queries": 0, **{p: Histogram() for p in PHASES}}
+        stats["total"].observe(total)
+        for phase in PHASES:
+            stats[phase].observe(getattr(timing, phase))
+        stats["queries"] += timing.queries
+
+
+def reset() -> None:
+    with _lock:
+        _views.clear()
+
+
+def _server_timing(total: float, timing: RequestTiming) -> str:
+    return (
+        f'db;dur={timing.db * 1000:.1f};desc="{timing.queries} queries", '
+        f"tpl;dur={timing.tpl * 1000:.1f}, cp;dur={timing.cp * 1000:.1f}, total;dur={total * 1000:.1f}"
+    )
+
+
+class TimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(_db_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, time.perf_counter() - start, timing)
+
+    async def __acall__(self, request):
+        # Queries from async views run in worker threads on their own
+        # connections, so only total (to the first byte) is measured here.
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, time.perf_counter() - start, timing)
+
+    def _finish(self, request, response, total, timing):
+        response["Server-Timing"] = _server_timing(total, timing)
+        record(_view_name(request), total, timing)
+        return response
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name, view, hist):
+    lines, cumulative = [], 0
+    for bound, count in zip(BUCKETS, hist.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{view="{view}",le="+Inf"}} {hist.n}')
+    lines.append(f'{name}_sum{{view="{view}"}} {hist.total:.6f}')
+    lines.append(f'{name}_count{{view="{view}"}} {hist.n}')
+    return lines
+
+
+def metrics_text() -> str:
+    """Everything recorded by this process, in Prometheus text format."""
+    families = [
+        ("total", "pickupplay_request_duration_seconds", "Time to produce the response, per view."),
+        ("db", "pickupplay_request_db_seconds", "Time spent in DB queries per request, per view."),
+        ("tpl", "pickupplay_request_template_seconds", "Template render time per request, per view."),
+        ("cp", "pickupplay_request_context_processor_seconds", "Context processor time per request, per view."),
+    ]
+    with _lock:
+        snapshot = {
+            view: {key: (value if key == "queries" else _copy(value)) for key, value in stats.items()}
+            for view, stats in _views.items()
+        }
+
+    lines = []
+    for key, name, help_text in families:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for view, stats in sorted(snapshot.items()):
+            lines += _histogram_lines(name, _label(view), stats[key])
+
+    lines += [
+        "# HELP pickupplay_request_db_queries_total DB queries run, per view.",
+        "# TYPE pickupplay_request_db_queries_total counter",
+    ]
+    for view, stats in sorted(snapshot.items()):
+        lines.append(f'pickupplay_request_db_queries_total{{view="{_label(view)}"}} {stats["queries"]}')
+
+    lines += [
+        "# HELP pickupplay_throttle_rejections_total Requests rejected by games.throttle.",
+        "# TYPE pickupplay_throttle_rejections_total counter",
+    ]
+    for (scope, kind), count in sorted(throttle.rejected_counts().items()):
+        lines.append(f'pickupplay_throttle_rejections_total{{scope="{_label(scope)}",bucket="{kind}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def _copy(hist: Histogram) -> Histogram:
+    copy = Histogram()
+    copy.counts, copy.total, copy.n = list(hist.counts), hist.total, hist.n
+    return copy
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:27
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    Game = apps.get_model("games", "Game")
+    games = Game.objects.annotate(
+        n_confirmed=Count("registrations", filter=Q(registrations__status="CONFIRMED")),
+        n_waitlist=Count("registrations", filter=Q(registrations__status="WAITLIST")),
+        n_pending=Count("registrations", filter=Q(registrations__status="PENDING")),
+    )
+    for game in games:
+        game.confirmed_count = game.n_confirmed
+        game.waitlist_count = game.n_waitlist
+        game.pending_count = game.n_pending
+        game.save(update_fields=["confirmed_count", "waitlist_count", "pending_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0004_alter_announcement_options_alter_game_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='confirmed_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='waitlist_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0005_game_roster_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='roster_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0006_game_roster_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccessCodeCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('next_index', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='access_code',
+            field=models.CharField(editable=False, max_length=5, null=True, unique=True),
+        ),
+    ]
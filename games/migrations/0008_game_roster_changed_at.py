@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:34
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0007_access_code_allocator'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='roster_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
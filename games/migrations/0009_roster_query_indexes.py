@@ -0,0 +1,33 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_game_roster_changed_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['-created_at'], name='activity_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['end_time'], name='game_end_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['game', 'status', 'position'], name='reg_game_status_pos_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['game', 'status', 'created_at'], name='reg_game_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['status', 'created_at'], name='reg_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:38
+
+from django.db import migrations, models
+
+CHUNK_SIZE = 1000
+MAX_LENGTH = 254  # Registration.email_normalized
+
+
+def backfill(apps, schema_editor):
+    """Fill email_normalized and any missing phone_digits, a chunk at a time.
+
+    Registrations that differ only by email case were allowed before; the
+    later ones get a " dup:<id>" suffix so the unique constraint can be
+    added. A space can't appear in a valid email, so the suffix never
+    collides with a real address, but it also means those players can no
+    longer log in to the player portal by email; the organizer has to fix
+    or remove the duplicate row.
+    """
+    Registration = apps.get_model("games", "Registration")
+    seen = set()
+    last_id = 0
+    while True:
+        chunk = list(
+            Registration.objects.filter(id__gt=last_id).order_by("id")
+            .only("id", "game_id", "email", "phone", "phone_digits")[:CHUNK_SIZE]
+        )
+        if not chunk:
+            return
+        for reg in chunk:
+            norm = (reg.email or "").strip().lower()
+            if (reg.game_id, norm) in seen:
+                suffix = f" dup:{reg.id}"
+                norm = norm[:MAX_LENGTH - len(suffix)] + suffix
+            seen.add((reg.game_id, norm))
+            reg.email_normalized = norm
+            if not reg.phone_digits:
+                reg.phone_digits = "".join(ch for ch in (reg.phone or "") if ch.isdigit())
+        Registration.objects.bulk_update(chunk, ["email_normalized", "phone_digits"])
+        last_id = chunk[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0009_roster_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registration',
+            name='email_normalized',
+            field=models.CharField(default='', editable=False, max_length=254),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0010_registration_email_normalized'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='registration',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='registration',
+            constraint=models.UniqueConstraint(fields=('game', 'email_normalized'), name='reg_game_email_norm_uniq'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0011_registration_email_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='registration',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-16 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0012_registration_created_at_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registration',
+            name='idempotency_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+    ]
@@ -1,4 +1,3 @@
-import random
 from django.db import models
 from django.utils import timezone
 
@@ -9,27 +8,42 @@ class Game(models.Model):
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
     capacity = models.PositiveIntegerField(default=18)
-    access_code = models.CharField(max_length=5, unique=True, editable=False)
+    # cleared when a long-finished game's code is recycled (see games.codes)
+    access_code = models.CharField(max_length=5, unique=True, null=True, editable=False)
+
+    # roster counters, kept in step by games.roster on every transition
+    confirmed_count = models.PositiveIntegerField(default=0, editable=False)
+    waitlist_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_count = models.PositiveIntegerField(default=0, editable=False)
+    # bumped whenever the public roster page would change; keys cached copies
+    roster_version = models.PositiveIntegerField(default=0, editable=False)
+    roster_changed_at = models.DateTimeField(default=timezone.now, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # dashboard: games that haven't ended yet
+            models.Index(fields=["end_time"], name="game_end_time_idx"),
+        ]
+
     def save(self, *args, **kwargs):
-        if not self.access_code:
-            self.access_code = self._generate_unique_code()
+        if self._state.adding and not self.access_code:
+            from .codes import allocate_codes
+            self.access_code = allocate_codes(1)[0]
         super().save(*args, **kwargs)
 
-    def _generate_unique_code(self):
-        while True:
-            code = f"{random.randint(0, 99999):05d}"
-            if not Game.objects.filter(access_code=code).exists():
-                return code
-
     @property
     def is_past(self):
         return self.end_time < timezone.now()
 
     def __str__(self):
-        return f"{self.title} ({self.access_code})"
+        return f"{self.title} ({self.access_code or 'retired'})"
+
+
+class AccessCodeCursor(models.Model):
+    """Single row holding how far games.codes has walked the code sequence."""
+    next_index = models.PositiveBigIntegerField(default=0)
 
 
 class Announcement(models.Model):
@@ -51,9 +65,42 @@ class Registration(models.Model):
         CANCELLED = "CANCELLED", "Cancelled"
         REMOVED = "REMOVED", "Removed by organizer"
 
+    # who asks for a status change (see TRANSITIONS)
+    ORGANIZER = "organizer"
+    PLAYER = "player"
+    SYSTEM = "system"
+
+    # Legal status changes, enforced by games.roster.transition():
+    # current status -> {new status: actors allowed to make the change}.
+    # A move to CONFIRMED on a full game lands on the waitlist instead.
+    TRANSITIONS = {
+        Status.PENDING: {
+            Status.CONFIRMED: {ORGANIZER},
+            Status.WAITLIST: {ORGANIZER},
+            Status.DENIED: {ORGANIZER},
+            Status.CANCELLED: {PLAYER},
+            Status.REMOVED: {ORGANIZER},
+        },
+        Status.CONFIRMED: {
+            Status.WAITLIST: {ORGANIZER},
+            Status.CANCELLED: {PLAYER},
+            Status.REMOVED: {ORGANIZER},
+        },
+        Status.WAITLIST: {
+            Status.CONFIRMED: {ORGANIZER, SYSTEM},
+            Status.CANCELLED: {PLAYER},
+            Status.REMOVED: {ORGANIZER},
+        },
+        Status.DENIED: {Status.REMOVED: {ORGANIZER}},
+        Status.CANCELLED: {Status.REMOVED: {ORGANIZER}},
+        Status.REMOVED: {},
+    }
+
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="registrations")
     name = models.CharField(max_length=120)
     email = models.EmailField()
+    # lowercased email: indexed login lookups and per-game uniqueness
+    email_normalized = models.CharField(max_length=254, editable=False)
     phone = models.CharField(max_length=40)
 
     # store digits-only phone for “password”
@@ -63,13 +110,43 @@ class Registration(models.Model):
     # position used separately for confirmed and waitlist
     position = models.PositiveIntegerField(null=True, blank=True)
 
-    created_at = models.DateTimeField(auto_now_add=True)
+    # arrival time; set explicitly by buffered intake (games.intake)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    # sign-up form token; a resubmit carrying it is the same request (games.roster.register_once)
+    idempotency_key = models.CharField(max_length=64, blank=True, default="", editable=False)
 
     class Meta:
-        unique_together = ("game", "email")
+        constraints = [
+            models.UniqueConstraint(fields=["game", "email_normalized"], name="reg_game_email_norm_uniq"),
+        ]
+        indexes = [
+            # confirmed / waitlist lists in position order
+            models.Index(fields=["game", "status", "position"], name="reg_game_status_pos_idx"),
+            # per-game arrival order: pending list, promotion, renumbering
+            models.Index(fields=["game", "status", "created_at"], name="reg_game_status_created_idx"),
+            # dashboard pending queue across all games
+            models.Index(fields=["status", "created_at"], name="reg_status_created_idx"),
+        ]
+
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        return (email or "").strip().lower()
+
+    @staticmethod
+    def digits(phone: str) -> str:
+        return "".join(ch for ch in (phone or "") if ch.isdigit())
+
+    def fill_derived(self):
+        """Set the columns computed from email and phone; returns self.
+
+        save() calls this; code that builds rows for bulk_create() must too.
+        """
+        self.email_normalized = self.normalize_email(self.email)
+        self.phone_digits = self.digits(self.phone)
+        return self
 
     def save(self, *args, **kwargs):
-        self.phone_digits = "".join(ch for ch in (self.phone or "") if ch.isdigit())
+        self.fill_derived()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -91,5 +168,11 @@ class Activity(models.Model):
     message = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # recent activity feed on organizer pages
+            models.Index(fields=["-created_at"], name="activity_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.kind} - {self.message}"
@@ -0,0 +1,38 @@
+import threading
+import time
+
+from .models import Announcement
+
+# Safety net for other worker processes, which don't see our invalidations.
+CACHE_TTL = 60
+
+_lock = threading.Lock()
+_generation = 0
+_entry = None  # (expires_at, announcements)
+
+
+def active_announcements() -> tuple:
+    """Active announcements, newest first, shared by the news bar and game page."""
+    entry = _entry
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    generation = _generation
+    items = tuple(Announcement.objects.filter(is_active=True).order_by("-created_at"))
+    _store(generation, items)
+    return items
+
+
+def _store(generation: int, items: tuple) -> None:
+    global _entry
+    with _lock:
+        # an invalidate() ran while we were querying; don't cache stale rows
+        if generation == _generation:
+            _entry = (time.monotonic() + CACHE_TTL, items)
+
+
+def invalidate() -> None:
+    global _entry, _generation
+    with _lock:
+        _generation += 1
+        _entry = None
@@ -0,0 +1,53 @@
+"""Keyset (cursor) pagination.
+
+A page is "the next N rows after this (sort key, id)", so every page costs
+the same index range scan however deep into the list it is. Cursors are
+opaque URL-safe tokens; an unreadable cursor just means "first page".
+"""
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+PAGE_SIZE = 25
+
+
+def encode_cursor(sort_value, pk) -> str:
+    # isoformat() rather than DjangoJSONEncoder, which drops microseconds
+    # and would make the next page repeat the last row
+    raw = json.dumps([sort_value.isoformat(), pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    """(datetime, id) from a cursor token, or None if missing/garbled."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        sort_value, pk = json.loads(raw)
+        moment = parse_datetime(sort_value)
+    except (ValueError, TypeError):
+        return None
+    if moment is None or not isinstance(pk, int):
+        return None
+    return moment, pk
+
+
+def keyset_page(qs, sort_field: str, cursor: str = None, size: int = PAGE_SIZE):
+    """Return (rows, next_cursor) for rows ordered by (sort_field, id).
+
+    next_cursor is None on the last page.
+    """
+    after = decode_cursor(cursor)
+    if after is not None:
+        value, pk = after
+        qs = qs.filter(Q(**{f"{sort_field}__gt": value}) | Q(**{sort_field: value, "id__gt": pk}))
+
+    rows = list(qs.order_by(sort_field, "id")[:size + 1])
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_field), last.pk)
@@ -0,0 +1,469 @@
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from functools import partial
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import live
+from .models import Game, Registration, Activity
+
+
+# -------------------------
+# Per-game locking
+# -------------------------
+
+# Striped in-process locks: transitions on the same game queue up behind each
+# other inside a worker, while select_for_update() covers other workers on
+# databases that support row locks.
+_LOCK_STRIPES = [threading.Lock() for _ in range(64)]
+
+
+class TransitionError(Exception):
+    """Raised when a registration can't make the requested move."""
+
+
+# Game counter field for each status that has one.
+COUNTER_FIELDS = {
+    Registration.Status.CONFIRMED: "confirmed_count",
+    Registration.Status.WAITLIST: "waitlist_count",
+    Registration.Status.PENDING: "pending_count",
+}
+
+
+@contextmanager
+def locked_game(game_id: int):
+    """Run the block as one transaction holding the lock for ``game_id``.
+
+    Counter changes made through count_change() are written back, together
+    with a roster_version bump, in a single UPDATE when the block finishes.
+    """
+    with locked_games([game_id]) as games:
+        if game_id not in games:
+            raise Game.DoesNotExist(f"No game with id {game_id}.")
+        yield games[game_id]
+
+
+@contextmanager
+def locked_games(game_ids):
+    """locked_game() for several games at once; yields {game id: game}.
+
+    Every stripe lock is taken, in stripe order, before the transaction
+    opens. Under BEGIN IMMEDIATE the transaction holds the SQLite write
+    lock, so taking a stripe inside it would invert the order used by
+    every other caller and stall both until the busy timeout.
+    """
+    stripes = sorted({game_id % len(_LOCK_STRIPES) for game_id in game_ids})
+    with ExitStack() as stack:
+        for stripe in stripes:
+            stack.enter_context(_LOCK_STRIPES[stripe])
+        with transaction.atomic():
+            games = {
+                game.pk: game
+                for game in Game.objects.select_for_update().filter(pk__in=game_ids).order_by("pk")
+            }
+            for game in games.values():
+                game._counter_deltas = Counter()
+            yield games
+            for game in games.values():
+                _flush_counters(game.pk, game._counter_deltas)
+
+
+# -------------------------
+# Helpers (call with the game locked)
+# -------------------------
+
+def _new_version() -> dict:
+    """Fields to write whenever the public roster changes."""
+    return {"roster_version": F("roster_version") + 1, "roster_changed_at": timezone.now()}
+
+
+def _announce(game_id: int) -> None:
+    transaction.on_commit(partial(live.roster_changed, game_id), robust=True)
+
+
+def _flush_counters(game_id: int, deltas: Counter) -> None:
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    Game.objects.filter(pk=game_id).update(**_new_version(), **changes)
+    _announce(game_id)
+
+
+def bump_version(game: Game) -> None:
+    """Invalidate cached roster data after a change outside a transition."""
+    Game.objects.filter(pk=game.pk).update(**_new_version())
+    _announce(game.pk)
+
+
+def adjust_counts(game_id: int, steps: Counter) -> None:
+    """Count registrations added or deleted outside a transition (the admin).
+
+    ``steps`` maps status -> how many were added (negative: deleted). It is
+    one F() UPDATE, which also bumps roster_version, so no game lock is
+    needed.
+    """
+    deltas = Counter()
+    for status, step in steps.items():
+        field = COUNTER_FIELDS.get(status)
+        if field:
+            deltas[field] += step
+    _flush_counters(game_id, deltas)
+
+
+def count_change(game: Game, status: str, step: int) -> None:
+    """Record ``step`` more/fewer registrations in ``status`` on a locked game."""
+    field = COUNTER_FIELDS.get(status)
+    if field:
+        setattr(game, field, getattr(game, field) + step)
+        game._counter_deltas[field] += step
+
+
+# One statement renumbers both lists: rows are ranked by arrival within their
+# status and only rows whose position actually changed are written.
+_RENUMBER_SQL = """
+    UPDATE {table}
+    SET position = ranked.rn
+    FROM (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY status ORDER BY created_at, id) AS rn
+        FROM {table}
+        WHERE game_id = %s AND status IN (%s, %s)
+    ) AS ranked
+    WHERE {table}.id = ranked.id
+      AND ({table}.position IS NULL OR {table}.position <> ranked.rn)
+"""
+
+
+def recalc_positions(game: Game) -> None:
+    sql = _RENUMBER_SQL.format(table=connection.ops.quote_name(Registration._meta.db_table))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [game.pk, Registration.Status.CONFIRMED, Registration.Status.WAITLIST])
+
+
+# -------------------------
+# Transitions
+# -------------------------
+
+# Insert-or-ignore against the (game, email_normalized) unique constraint.
+# RETURNING hands back the new id, or no row when the email was already
+# registered, so a duplicate costs no extra query and never raises.
+_REGISTER_SQL = """
+    INSERT INTO {table} ({columns}) VALUES ({params})
+    ON CONFLICT (game_id, email_normalized) DO NOTHING
+    RETURNING id
+"""
+
+CREATED = "created"
+DUPLICATE = "duplicate"
+IN_PROGRESS = "in-progress"
+IDEMPOTENCY_TIMEOUT = 60 * 60
+
+
+def register(game: Game, name: str, email: str, phone: str, token: str = ""):
+    """Create a PENDING request and count it on the game.
+
+    Returns the new Registration, or None if the email is already registered
+    for this game. When the existing row was created with the same
+    ``token``, this is a resubmit of that request and the original row is
+    returned instead.
+    """
+    reg = Registration(
+        game=game, name=name, email=email, phone=phone, status=Registration.Status.PENDING,
+        idempotency_key=token,
+    ).fill_derived()
+    fields = [f for f in Registration._meta.concrete_fields if not f.primary_key]
+    sql = _REGISTER_SQL.format(
+        table=connection.ops.quote_name(Registration._meta.db_table),
+        columns=", ".join(connection.ops.quote_name(f.column) for f in fields),
+        params=", ".join(["%s"] * len(fields)),
+    )
+    values = [f.get_db_prep_save(f.pre_save(reg, add=True), connection) for f in fields]
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, values)
+            row = cursor.fetchone()
+        if row is None:
+            if not token:
+                return None
+            return game.registrations.filter(email_normalized=reg.email_normalized, idempotency_key=token).first()
+        reg.pk = row[0]
+        reg._state.adding = False
+
+        Activity.objects.create(
+            game=game, registration=reg,
+            kind=Activity.Kind.REQUESTED,
+            message=f"New request: {reg.name} ({reg.email})"
+        )
+        Game.objects.filter(pk=game.pk).update(pending_count=F("pending_count") + 1, **_new_version())
+        _announce(game.pk)
+    return reg
+
+
+def register_once(game: Game, name: str, email: str, phone: str, token: str = "") -> str:
+    """register(), made idempotent by a client-supplied ``token``.
+
+    Returns CREATED, DUPLICATE or IN_PROGRESS. A resubmit with the same token (double
+    click, browser retry) gets the first submit's outcome instead of running
+    again: the token is stored on the new row, so a resubmit that reaches
+    another worker is matched to it by register(). Within a worker, a
+    resubmit waits for a first submit still in flight, and gets IN_PROGRESS
+    if that takes longer than a few seconds.
+    """
+    if not token:
+        return CREATED if register(game, name, email, phone) else DUPLICATE
+
+    key = f"register:{game.pk}:{token}"
+    if not cache.add(key, IN_PROGRESS, IDEMPOTENCY_TIMEOUT):
+        outcome = _await_outcome(key)
+        if outcome is not None:
+            return outcome
+        # the first submit failed and released the token: run this one
+    try:
+        outcome = CREATED if register(game, name, email, phone, token) else DUPLICATE
+    except BaseException:
+        cache.delete(key)
+        raise
+    cache.set(key, outcome, IDEMPOTENCY_TIMEOUT)
+    return outcome
+
+
+def _await_outcome(key: str, timeout: float = 3.0):
+    """The cached outcome once it's final, IN_PROGRESS after ``timeout``, or
+    None if the token was released."""
+    deadline = time.monotonic() + timeout
+    while True:
+        outcome = cache.get(key)
+        if outcome != IN_PROGRESS or time.monotonic() >= deadline:
+            return outcome
+        time.sleep(0.05)
+
+
+def _illegal(reg: Registration, to_status: str) -> str:
+    label = Registration.Status(to_status).label
+    if reg.status == to_status:
+        return f"{reg.name} is already {label.lower()}."
+    return f"{reg.name} can’t go from {reg.get_status_display()} to {label}."
+
+
+# Activity for moves that aren't approvals, promotions or list moves.
+_ACTIVITY = {
+    Registration.Status.DENIED: (Activity.Kind.DENIED, "Denied: {reg.name}"),
+    Registration.Status.CANCELLED: (Activity.Kind.CANCELLED, "{reg.name} cancelled (email: {reg.email})"),
+    Registration.Status.REMOVED: (Activity.Kind.REMOVED, "Removed: {reg.name}"),
+}
+
+
+def _activity(game: Game, reg: Registration, old_status: str, actor: str) -> Activity:
+    """The activity row for ``reg`` having just moved from ``old_status``."""
+    if actor == Registration.SYSTEM:
+        kind, msg = Activity.Kind.MOVED, f"Auto-promoted from waitlist: {reg.name}"
+    elif reg.status in _ACTIVITY:
+        kind, template = _ACTIVITY[reg.status]
+        msg = template.format(reg=reg)
+    elif old_status == Registration.Status.PENDING:
+        kind, msg = Activity.Kind.APPROVED, f"Approved ({reg.status}): {reg.name}"
+    else:
+        kind, msg = Activity.Kind.MOVED, f"Moved: {reg.name} → {reg.status}"
+    return Activity(game=game, registration=reg, kind=kind, message=msg)
+
+
+def _move(game: Game, reg: Registration, status: str) -> None:
+    count_change(game, reg.status, -1)
+    count_change(game, status, 1)
+    reg.status = status
+    reg.position = None
+
+
+def _promote_from_waitlist(game: Game, exclude: list) -> list:
+    """Waitlisted registrations that fit in the open confirmed spots."""
+    open_spots = game.capacity - game.confirmed_count
+    if open_spots <= 0:
+        return []
+    return list(
+        game.registrations.filter(status=Registration.Status.WAITLIST)
+        .exclude(pk__in=[reg.pk for reg in exclude])
+        .order_by("created_at", "id")[:open_spots]
+    )
+
+
+def transition(regs, to_status: str, actor: str, expect: str = None) -> list:
+    """Move many registrations, possibly across games, to ``to_status``.
+
+    Each game is locked once. Every move is checked against
+    Registration.TRANSITIONS for ``actor``; an illegal one raises
+    TransitionError and nothing is written. Moves to CONFIRMED fill open
+    spots in arrival order and waitlist the rest. Per game, statuses are
+    written with one bulk_update and activity with one bulk_create, and the
+    waitlist is promoted and the lists renumbered once.
+
+    With ``expect``, registrations no longer in that status (someone got
+    there first) are skipped instead of rejected. Returns the registrations
+    that changed, with their new status.
+    """
+    if to_status not in Registration.Status.values:
+        raise TransitionError("Unknown status.")
+
+    by_game = {}
+    for reg in regs:
+        by_game.setdefault(reg.game_id, []).append(reg.pk)
+
+    changed = []
+    if not by_game:
+        return changed
+    # one transaction for all the games, so an illegal move in one writes nothing
+    with locked_games(by_game) as games:
+        for game_id in sorted(games):
+            changed += _transition_game(games[game_id], by_game[game_id], to_status, actor, expect)
+    return changed
+
+
+def _transition_game(game: Game, reg_ids: list, to_status: str, actor: str, expect) -> list:
+    Status = Registration.Status
+    regs = list(game.registrations.filter(pk__in=reg_ids).order_by("created_at", "id"))
+    if expect is not None:
+        regs = [reg for reg in regs if reg.status == expect]
+    for reg in regs:
+        if actor not in Registration.TRANSITIONS[reg.status].get(to_status, ()):
+            raise TransitionError(_illegal(reg, to_status))
+
+    open_spots = max(game.capacity - game.confirmed_count, 0)
+    changed, activity, listed, freed = [], [], False, False
+    for reg in regs:
+        status = to_status
+        if status == Status.CONFIRMED:
+            if open_spots:
+                open_spots -= 1
+            else:
+                status = Status.WAITLIST
+        if status == reg.status:
+            continue  # waitlisted, and the game is still full
+        old_status = reg.status
+        _move(game, reg, status)
+        changed.append(reg)
+        activity.append(_activity(game, reg, old_status, actor))
+        listed = listed or bool({old_status, status} & {Status.CONFIRMED, Status.WAITLIST})
+        freed = freed or old_status == Status.CONFIRMED
+
+    promoted = _promote_from_waitlist(game, exclude=changed) if freed else []
+    for reg in promoted:
+        _move(game, reg, Status.CONFIRMED)
+        activity.append(_activity(game, reg, Status.WAITLIST, Registration.SYSTEM))
+
+    Registration.objects.bulk_update(changed + promoted, ["status", "position"])
+    if listed:
+        recalc_positions(game)
+    Activity.objects.bulk_create(activity)
+    return changed
+
+
+def _only(changed: list, error: str) -> Registration:
+    if not changed:
+        raise TransitionError(error)
+    return changed[0]
+
+
+def approve(reg: Registration):
+    """PENDING → CONFIRMED, or WAITLIST when the game is full."""
+    reg = _only(
+        transition([reg], Registration.Status.CONFIRMED, Registration.ORGANIZER, expect=Registration.Status.PENDING),
+        "This request was already processed.",
+    )
+    return reg, f"Approved ({reg.status}): {reg.name}"
+
+
+def decide_pending(game_id: int, approve_them: bool, reg_ids=None, first_n=None) -> Counter:
+    """Approve or deny many PENDING requests for one game in one transaction.
+
+    Picks ``reg_ids`` (ignoring ones no longer pending) or the first
+    ``first_n`` in arrival order. Approvals fill open spots in arrival order
+    and waitlist the rest. Returns how many ended up in each status.
+    """
+    pending = (
+        Registration.objects.filter(game_id=game_id, status=Registration.Status.PENDING)
+        .order_by("created_at", "id").only("game_id")
+    )
+    if reg_ids is not None:
+        pending = pending.filter(pk__in=reg_ids)
+    if first_n is not None:
+        pending = pending[:first_n]
+
+    status = Registration.Status.CONFIRMED if approve_them else Registration.Status.DENIED
+    changed = transition(pending, status, Registration.ORGANIZER, expect=Registration.Status.PENDING)
+    return Counter(reg.status for reg in changed)
+
+
+def deny(reg: Registration):
+    reg = _only(
+        transition([reg], Registration.Status.DENIED, Registration.ORGANIZER, expect=Registration.Status.PENDING),
+        "This request was already processed.",
+    )
+    return reg, f"Denied: {reg.name}"
+
+
+def cancel(reg: Registration):
+    """Player-initiated cancel; frees the spot for the waitlist."""
+    reg = _only(
+        transition([reg], Registration.Status.CANCELLED, Registration.PLAYER),
+        "This registration no longer exists.",
+    )
+    return reg, f"{reg.name} cancelled (email: {reg.email})"
+
+
+def remove(reg: Registration):
+    """Organizer removes a player from whichever list they're on."""
+    reg = _only(
+        transition([reg], Registration.Status.REMOVED, Registration.ORGANIZER),
+        "This registration no longer exists.",
+    )
+    return reg, f"Removed: {reg.name}"
+
+
+def move(reg: Registration, target: str):
+    """Organizer moves a player between CONFIRMED and WAITLIST (or approves a PENDING one)."""
+    target = target.upper()
+    if target not in [Registration.Status.CONFIRMED, Registration.Status.WAITLIST]:
+        raise TransitionError("Invalid target list.")
+
+    reg = _only(
+        transition([reg], target, Registration.ORGANIZER),
+        f"The confirmed list is full; {reg.name} stays on the waitlist.",
+    )
+    return reg, f"Moved: {reg.name} → {reg.status}"
+
+
+# -------------------------
+# Public roster (cached)
+# -------------------------
+
+ROSTER_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _roster_cache_key(game: Game) -> str:
+    return f"roster:{game.pk}:{game.roster_version}"
+
+
+def public_roster(game: Game) -> dict:
+    """Confirmed and waitlist names for the public game page.
+
+    Cached per roster_version, which the caller already loaded with the game,
+    so a warm read costs no queries. Any transition bumps the version and the
+    next read rebuilds under the new key; old entries just age out.
+    """
+    key = _roster_cache_key(game)
+    data = cache.get(key)
+    if data is None:
+        rows = (
+            game.registrations
+            .filter(status__in=[Registration.Status.CONFIRMED, Registration.Status.WAITLIST])
+            .order_by("position")
+            .values_list("status", "name", "position")
+        )
+        data = {"confirmed": [], "waitlist": []}
+        for status, name, position in rows:
+            bucket = "confirmed" if status == Registration.Status.CONFIRMED else "waitlist"
+            data[bucket].append({"name": name, "position": position})
+        cache.set(key, data, ROSTER_CACHE_TIMEOUT)
+    return data
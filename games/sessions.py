@@ -0,0 +1,61 @@
+"""Player portal logins kept in the session.
+
+All of a browser's portal logins live under one session key,
+``players = {code: [registration id, expires at (unix time)]}``, so logging
+into several games doesn't grow the session one key per game forever. An
+entry stops counting once it expires and is dropped on the next write.
+"""
+import time
+
+from django.conf import settings
+
+PLAYERS_KEY = "players"
+PLAYER_SESSION_SECONDS = 60 * 60 * 8
+
+
+def has_session(request) -> bool:
+    """True if the browser sent a session cookie.
+
+    Checking the cookie instead of request.session means pages for anonymous
+    visitors never load the session (and don't get Vary: Cookie).
+    """
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def is_organizer(request) -> bool:
+    return has_session(request) and request.session.get("is_organizer") is True
+
+
+def _live(entries: dict, now: float) -> dict:
+    return {code: entry for code, entry in entries.items() if entry[1] > now}
+
+
+def player_reg_id(request, code: str):
+    """Registration id this browser is logged in as for game ``code``, or None."""
+    if not has_session(request):
+        return None
+    entry = request.session.get(PLAYERS_KEY, {}).get(code)
+    if entry is None or entry[1] <= time.time():
+        return None
+    return entry[0]
+
+
+def remember_player(request, code: str, reg_id: int, seconds: int = PLAYER_SESSION_SECONDS) -> None:
+    now = time.time()
+    entries = _live(request.session.get(PLAYERS_KEY, {}), now)
+    entries[code] = [reg_id, int(now + seconds)]
+    request.session[PLAYERS_KEY] = entries
+    # the session itself lives as long as its longest login; an organizer's
+    # session keeps its own lifetime when that is longer
+    seconds_left = max(entry[1] for entry in entries.values()) - int(now)
+    if request.session.get("is_organizer") is True:
+        seconds_left = max(seconds_left, request.session.get_expiry_age())
+    request.session.set_expiry(seconds_left)
+
+
+def forget_player(request, code: str) -> None:
+    if not has_session(request):
+        return
+    entries = _live(request.session.get(PLAYERS_KEY, {}), time.time())
+    entries.pop(code, None)
+    request.session[PLAYERS_KEY] = entries
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import news
+from .models import Announcement
+
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+def announcement_changed(sender, **kwargs):
+    # covers news_save/news_delete as well as the admin
+    transaction.on_commit(news.invalidate)
@@ -32,8 +32,44 @@ document.addEventListener("DOMContentLoaded", () => {
     tick();
     setInterval(tick, 30000);
   }
+
+  // Live roster updates on game page
+  const streamUrlEl = document.getElementById("rosterStreamUrl");
+  if (streamUrlEl && window.EventSource) {
+    const source = new EventSource(streamUrlEl.value);
+    source.addEventListener("roster", (e) => applyRoster(JSON.parse(e.data)));
+  }
 });
 
+function fillList(listId, emptyId, names) {
+  const list = document.getElementById(listId);
+  const empty = document.getElementById(emptyId);
+  if (!list) return;
+
+  list.replaceChildren(...names.map((name) => {
+    const li = document.createElement("li");
+    li.className = "list-item";
+    li.textContent = name;
+    return li;
+  }));
+  if (empty) empty.classList.toggle("d-none", names.length > 0);
+}
+
+function applyRoster(roster) {
+  fillList("confirmedList", "confirmedEmpty", roster.confirmed);
+  fillList("waitlistList", "waitlistEmpty", roster.waitlist);
+
+  const counts = {
+    confirmedCount: roster.confirmed_count,
+    waitlistCount: roster.waitlist_count,
+    pendingCount: roster.pending_count,
+  };
+  for (const [id, value] of Object.entries(counts)) {
+    const el = document.getElementById(id);
+    if (el) el.textContent = value;
+  }
+}
+
 function copyCode() {
   const codeText = document.getElementById("codeText");
   if (!codeText) return;
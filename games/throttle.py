@@ -0,0 +1,174 @@
+"""Token-bucket throttling for the endpoints that check guessable secrets.
+
+Game codes are 5 digits and portal passwords are phone digits, so scripted
+guessing is cheap. POSTs to those views first take a token from a bucket per
+client IP and, where it makes sense, per target (the game + email being
+logged into). An empty bucket means 429 with Retry-After, returned before
+the view runs any query.
+
+A target bucket is shared by every client, so it caps distributed guessing
+but also lets anyone lock that target out by spending its tokens on wrong
+guesses. That is acceptable for one player's portal login, not for the
+single organizer code, so organizer login is limited per IP only.
+
+Lookups by game code (the game page, portal login, roster API and live
+feed) answer 404 for unknown codes on any method, so throttle_misses() also
+charges each 404 to a per-IP bucket and answers 429 once it is empty.
+
+Buckets live in the default cache, so they are shared between workers when
+the cache is (CACHE_DIR). Updates are read-modify-write rather than atomic,
+so a burst of concurrent requests can slip a token or two past the limit,
+which is fine for shedding load. Rates are settings.THROTTLE_RATES:
+scope -> {"ip" | "target": (attempts per minute, burst)}.
+"""
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+
+_rejected = Counter()  # (scope, "ip" | "target") -> rejected requests
+_rejected_lock = threading.Lock()
+
+
+def client_ip(request) -> str:
+    if getattr(settings, "THROTTLE_TRUST_X_FORWARDED_FOR", False):
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _refill(key: str, per_minute: float, burst: int):
+    rate = per_minute / 60.0
+    now = time.time()
+    tokens, stamp = cache.get(key) or (burst, now)
+    return min(burst, tokens + (now - stamp) * rate), now, rate
+
+
+def take(key: str, per_minute: float, burst: int) -> float:
+    """Take one token from bucket ``key``.
+
+    Returns 0 when allowed, otherwise the seconds until a token is free.
+    """
+    tokens, now, rate = _refill(key, per_minute, burst)
+    wait = 0.0
+    if tokens >= 1:
+        tokens -= 1
+    else:
+        wait = (1 - tokens) / rate
+    # kept only until the bucket would be full again anyway
+    cache.set(key, (tokens, now), timeout=int((burst - tokens) / rate) + 1)
+    return wait
+
+
+def peek(key: str, per_minute: float, burst: int) -> float:
+    """Like take(), but leaves the bucket as it is."""
+    tokens, _, rate = _refill(key, per_minute, burst)
+    return 0.0 if tokens >= 1 else (1 - tokens) / rate
+
+
+def rejected_counts() -> dict:
+    """Rejections per (scope, bucket kind) since this process started."""
+    with _rejected_lock:
+        return dict(_rejected)
+
+
+def reset() -> None:
+    with _rejected_lock:
+        _rejected.clear()
+
+
+def _too_many(wait: float) -> HttpResponse:
+    seconds = max(int(wait + 0.999), 1)
+    resp = HttpResponse(
+        f"Too many attempts. Try again in {seconds} seconds.\n",
+        status=429, content_type="text/plain; charset=utf-8",
+    )
+    resp["Retry-After"] = str(seconds)
+    return resp
+
+
+def throttle(scope: str, target=None):
+    """Throttle POSTs to a view.
+
+    ``target(request, *args, **kwargs)`` names what is being guessed; it gets
+    its own bucket shared by every client.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            rates = settings.THROTTLE_RATES.get(scope, {}) if request.method == "POST" else {}
+            buckets = []
+            if "ip" in rates:
+                buckets.append(("ip", client_ip(request)))
+            if "target" in rates and target is not None:
+                buckets.append(("target", target(request, *args, **kwargs)))
+
+            for kind, ident in buckets:
+                wait = take(f"throttle:{scope}:{kind}:{ident}", *rates[kind])
+                if wait:
+                    return _reject(scope, kind, wait)
+            return view_func(request, *args, **kwargs)
+        return _wrapped
+    return decorator
+
+
+def _reject(scope: str, kind: str, wait: float) -> HttpResponse:
+    with _rejected_lock:
+        _rejected[(scope, kind)] += 1
+    return _too_many(wait)
+
+
+def throttle_misses(scope: str = "code_lookup"):
+    """Throttle code guessing through lookups, for any method.
+
+    Every 404 from the view takes a token from the client IP's bucket; once
+    it is empty the view answers 429 without running. Hits cost nothing, so
+    players following a valid link are never slowed down.
+    """
+    def decorator(view_func):
+        def _bucket(request):
+            rates = settings.THROTTLE_RATES.get(scope, {}).get("ip")
+            return (f"throttle:{scope}:ip:{client_ip(request)}", *rates) if rates else None
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped(request, *args, **kwargs):
+                bucket = _bucket(request)
+                if bucket is None:
+                    return await view_func(request, *args, **kwargs)
+                wait = peek(*bucket)
+                if wait:
+                    return _reject(scope, "ip", wait)
+                try:
+                    response = await view_func(request, *args, **kwargs)
+                except Http404:
+                    take(*bucket)
+                    raise
+                if response.status_code == 404:
+                    take(*bucket)
+                return response
+        else:
+            @wraps(view_func)
+            def _wrapped(request, *args, **kwargs):
+                bucket = _bucket(request)
+                if bucket is None:
+                    return view_func(request, *args, **kwargs)
+                wait = peek(*bucket)
+                if wait:
+                    return _reject(scope, "ip", wait)
+                try:
+                    response = view_func(request, *args, **kwargs)
+                except Http404:
+                    take(*bucket)
+                    raise
+                if response.status_code == 404:
+                    take(*bucket)
+                return response
+        return _wrapped
+    return decorator
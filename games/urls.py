@@ -7,6 +7,8 @@ urlpatterns = [
     # Players
     path("", views.enter_code, name="enter_code"),
     path("game/<str:code>/", views.game_detail, name="game_detail"),
+    path("game/<str:code>/live/", views.roster_stream, name="roster_stream"),
+    path("api/game/<str:code>/roster/", views.roster_api, name="roster_api"),
 
     # Player portal (check status / cancel)
     path("my/<str:code>/", views.player_portal_login, name="player_portal_login"),
@@ -24,6 +26,7 @@ urlpatterns = [
     # Approve/Deny registrations (pending list)
     path("dashboard/approve/<int:reg_id>/", views.approve_registration, name="approve_registration"),
     path("dashboard/deny/<int:reg_id>/", views.deny_registration, name="deny_registration"),
+    path("dashboard/pending/bulk/", views.bulk_registrations, name="bulk_registrations"),
 
     # Edit/Delete games
     path("dashboard/game/<int:game_id>/edit/", views.edit_game, name="edit_game"),
@@ -31,9 +34,15 @@ urlpatterns = [
 
     # Organizer manage a specific game (add/remove/move players)
     path("dashboard/game/<int:game_id>/", views.manage_game, name="manage_game"),
+    path("dashboard/game/<int:game_id>/import/", views.import_registrations, name="import_registrations"),
     path("dashboard/game/<int:game_id>/remove/<int:reg_id>/", views.organizer_remove_player, name="organizer_remove_player"),
     path("dashboard/game/<int:game_id>/move/<int:reg_id>/<str:target>/", views.organizer_move_player, name="organizer_move_player"),
 
+    # Exports (CSV / JSONL, streamed)
+    path("dashboard/export/registrations/", views.export_registrations, name="export_registrations"),
+    path("dashboard/export/activity/", views.export_activity, name="export_activity"),
+    path("dashboard/metrics/", views.prometheus_metrics, name="metrics"),
+
     path("news/save/", views.news_save, name="news_save"),
     path("news/<int:news_id>/delete/", views.news_delete, name="news_delete"),
 ]
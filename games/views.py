@@ -1,11 +1,23 @@
+import csv
+import io
+import uuid
+from collections import Counter
 from functools import wraps
 
 from django.conf import settings
 from django.contrib import messages
-from django.http import HttpResponseForbidden
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, connection, transaction
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse,
+)
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
 
+from . import exports, imports, intake, live, metrics, news, pagination, roster, sessions, throttle
 from .models import Game, Registration, Announcement, Activity
 from .forms import GameForm
 
@@ -17,14 +29,15 @@ from .forms import GameForm
 def organizer_required(view_func):
     @wraps(view_func)
     def _wrapped(request, *args, **kwargs):
-        if request.session.get("is_organizer") is True:
+        if sessions.is_organizer(request):
             return view_func(request, *args, **kwargs)
         return HttpResponseForbidden("Not allowed.")
     return _wrapped
 
 
+@throttle.throttle("organizer_login")
 def organizer_login(request):
-    if request.session.get("is_organizer") is True:
+    if sessions.is_organizer(request):
         return redirect("games:dashboard")
 
     if request.method == "POST":
@@ -53,41 +66,42 @@ def organizer_logout(request):
 def _player_required(view_func):
     @wraps(view_func)
     def _wrapped(request, code, *args, **kwargs):
-        key = f"player_reg_{code}"
-        if request.session.get(key):
+        if sessions.player_reg_id(request, code):
             return view_func(request, code, *args, **kwargs)
         return redirect("games:player_portal_login", code=code)
     return _wrapped
 
 
+def _portal_login_target(request, code):
+    return f"{code}:{Registration.normalize_email(request.POST.get('email', ''))}"
+
+
+@throttle.throttle_misses()
+@throttle.throttle("player_portal_login", target=_portal_login_target)
 def player_portal_login(request, code):
     game = get_object_or_404(Game, access_code=code)
 
     if request.method == "POST":
-        email = request.POST.get("email", "").strip().lower()
-        phone_pw = "".join(ch for ch in request.POST.get("password", "") if ch.isdigit())
+        email = Registration.normalize_email(request.POST.get("email", ""))
+        phone_pw = Registration.digits(request.POST.get("password", ""))
 
-        reg = Registration.objects.filter(game=game, email__iexact=email).first()
+        reg = Registration.objects.filter(game=game, email_normalized=email).first()
+        latest = intake.outcome(code, email) if not reg and intake.enabled() else None
+        if latest and latest["status"] == intake.QUEUED:
+            messages.info(request, "Your request is still being processed. Try again in a few seconds.")
+            return redirect("games:player_portal_login", code=code)
+        if latest and latest["status"] == intake.FAILED:
+            messages.error(request, "Your request couldn’t be saved. Please sign up again.")
+            return redirect("games:game_detail", code=code)
         if not reg:
             messages.error(request, "No registration found for that email on this game.")
             return redirect("games:player_portal_login", code=code)
 
-        computed_digits = "".join(ch for ch in (reg.phone or "") if ch.isdigit())
-
-        ok = False
-        if reg.phone_digits and reg.phone_digits == phone_pw:
-            ok = True
-        elif (not reg.phone_digits) and computed_digits == phone_pw:
-            reg.phone_digits = computed_digits
-            reg.save(update_fields=["phone_digits"])
-            ok = True
-
-        if not ok:
+        if not phone_pw or reg.phone_digits != phone_pw:
             messages.error(request, "Wrong password. Use your phone number digits only.")
             return redirect("games:player_portal_login", code=code)
 
-        request.session[f"player_reg_{code}"] = reg.id
-        request.session.set_expiry(60 * 60 * 8)
+        sessions.remember_player(request, code, reg.id)
         return redirect("games:player_portal_manage", code=code)
 
     return render(request, "games/player_portal_login.html", {"game": game})
@@ -96,14 +110,19 @@ def player_portal_login(request, code):
 @_player_required
 def player_portal_manage(request, code):
     game = get_object_or_404(Game, access_code=code)
-    reg_id = request.session.get(f"player_reg_{code}")
+    reg_id = sessions.player_reg_id(request, code)
     reg = get_object_or_404(Registration, id=reg_id, game=game)
+    latest = intake.outcome(code, reg.email) if intake.enabled() else None
 
-    return render(request, "games/player_portal_manage.html", {"game": game, "reg": reg})
+    return render(request, "games/player_portal_manage.html", {
+        "game": game,
+        "reg": reg,
+        "duplicate_request": latest is not None and latest["status"] == intake.DUPLICATE,
+    })
 
 
 def player_portal_logout(request, code):
-    request.session.pop(f"player_reg_{code}", None)
+    sessions.forget_player(request, code)
     messages.success(request, "Logged out.")
     return redirect("games:game_detail", code=code)
 
@@ -111,26 +130,16 @@ def player_portal_logout(request, code):
 @_player_required
 def player_cancel(request, code):
     game = get_object_or_404(Game, access_code=code)
-    reg_id = request.session.get(f"player_reg_{code}")
+    reg_id = sessions.player_reg_id(request, code)
     reg = get_object_or_404(Registration, id=reg_id, game=game)
 
     if request.method == "POST":
-        if reg.status in [Registration.Status.CANCELLED, Registration.Status.REMOVED, Registration.Status.DENIED]:
-            messages.error(request, "This registration can’t be cancelled.")
+        try:
+            roster.cancel(reg)
+        except roster.TransitionError as e:
+            messages.error(request, str(e))
             return redirect("games:player_portal_manage", code=code)
 
-        reg.status = Registration.Status.CANCELLED
-        reg.position = None
-        reg.save()
-
-        Activity.objects.create(
-            game=game, registration=reg,
-            kind=Activity.Kind.CANCELLED,
-            message=f"{reg.name} cancelled (email: {reg.email})"
-        )
-
-        _promote_from_waitlist_if_needed(game)
-
         messages.success(request, "Cancelled. You are removed from the list.")
         return redirect("games:player_portal_manage", code=code)
 
@@ -141,6 +150,7 @@ def player_cancel(request, code):
 # Player Views
 # -------------------------
 
+@throttle.throttle("enter_code")
 def enter_code(request):
     if request.method == "POST":
         code = request.POST.get("code", "").strip()
@@ -159,13 +169,14 @@ def enter_code(request):
     return render(request, "games/enter_code.html")
 
 
+@throttle.throttle_misses()
 def game_detail(request, code):
     game = get_object_or_404(Game, access_code=code)
 
     if game.is_past:
         return render(request, "games/game_closed.html", {"game": game})
 
-    announcements = Announcement.objects.filter(is_active=True).order_by("-created_at")
+    announcements = news.active_announcements()
 
     if request.method == "POST":
         name = request.POST.get("name", "").strip()
@@ -176,23 +187,27 @@ def game_detail(request, code):
             messages.error(request, "Please fill out all fields.")
             return redirect("games:game_detail", code=code)
 
-        if Registration.objects.filter(game=game, email=email).exists():
-            messages.error(request, "This email is already registered for this game.")
+        if intake.enabled():
+            # written by the intake flusher; duplicates show up in the portal
+            intake.submit(game, name, email, phone)
+            messages.success(
+                request,
+                "Request received. It shows up in a few seconds; check it with 'Manage my spot' "
+                "(email + phone digits)."
+            )
             return redirect("games:game_detail", code=code)
 
-        reg = Registration.objects.create(
-            game=game,
-            name=name,
-            email=email,
-            phone=phone,
-            status=Registration.Status.PENDING,
-        )
-
-        Activity.objects.create(
-            game=game, registration=reg,
-            kind=Activity.Kind.REQUESTED,
-            message=f"New request: {reg.name} ({reg.email})"
-        )
+        token = request.POST.get("idempotency_key", "")[:64]
+        outcome = roster.register_once(game, name, email, phone, token)
+        if outcome == roster.DUPLICATE:
+            messages.error(request, "This email is already registered for this game.")
+            return redirect("games:game_detail", code=code)
+        if outcome == roster.IN_PROGRESS:
+            messages.info(
+                request,
+                "Your request is still being processed. Check it with 'Manage my spot' in a few seconds."
+            )
+            return redirect("games:game_detail", code=code)
 
         messages.success(
             request,
@@ -200,52 +215,90 @@ def game_detail(request, code):
         )
         return redirect("games:game_detail", code=code)
 
-    confirmed = game.registrations.filter(status=Registration.Status.CONFIRMED).order_by("position")
-    waitlist = game.registrations.filter(status=Registration.Status.WAITLIST).order_by("position")
-    pending_count = game.registrations.filter(status=Registration.Status.PENDING).count()
+    lists = roster.public_roster(game)
 
     context = {
         "game": game,
         "announcements": announcements,
-        "confirmed": confirmed,
-        "waitlist": waitlist,
-        "pending_count": pending_count,
+        "confirmed": lists["confirmed"],
+        "waitlist": lists["waitlist"],
+        "pending_count": game.pending_count,
+        # only ASGI can hold the SSE stream open; under WSGI the page skips it
+        "live_updates": isinstance(request, ASGIRequest),
+        # lets a resubmit of the same form get the first submit's result
+        "idempotency_key": uuid.uuid4().hex,
     }
     return render(request, "games/game_detail.html", context)
 
 
+@throttle.throttle_misses()
+async def roster_stream(request, code):
+    """Server-Sent Events feed of roster changes for one game."""
+    if not isinstance(request, ASGIRequest):
+        # An endless stream would pin a WSGI worker; 204 tells EventSource
+        # to stop reconnecting and the page keeps working without live updates.
+        return HttpResponse(status=204)
+
+    game = await Game.objects.filter(access_code=code).afirst()
+    if game is None:
+        raise Http404("No such game.")
+
+    response = StreamingHttpResponse(live.roster_events(game), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@throttle.throttle_misses()
+@require_GET
+def roster_api(request, code):
+    """Read-only JSON roster. Conditional GETs are answered from the game
+    row alone: a matching If-None-Match/If-Modified-Since costs one query."""
+    game = get_object_or_404(Game, access_code=code)
+
+    # "closed" flips when the game ends, without a roster_version bump
+    closed = game.is_past
+    etag = f'"{game.pk}-{game.roster_version}{"-closed" if closed else ""}"'
+    changed_at = max(game.roster_changed_at, game.end_time) if closed else game.roster_changed_at
+    last_modified = int(changed_at.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        lists = roster.public_roster(game)
+        response = JsonResponse({
+            "code": game.access_code,
+            "title": game.title,
+            "location": game.location,
+            "start_time": game.start_time,
+            "end_time": game.end_time,
+            "closed": closed,
+            "capacity": game.capacity,
+            "counts": {
+                "confirmed": game.confirmed_count,
+                "waitlist": game.waitlist_count,
+                "pending": game.pending_count,
+            },
+            "confirmed": lists["confirmed"],
+            "waitlist": lists["waitlist"],
+        })
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
 # -------------------------
 # Helpers
 # -------------------------
 
-def _recalc_positions(game: Game) -> None:
-    confirmed = game.registrations.filter(status=Registration.Status.CONFIRMED).order_by("created_at")
-    for i, r in enumerate(confirmed, start=1):
-        if r.position != i:
-            r.position = i
-            r.save(update_fields=["position"])
-
-    waitlist = game.registrations.filter(status=Registration.Status.WAITLIST).order_by("created_at")
-    for i, r in enumerate(waitlist, start=1):
-        if r.position != i:
-            r.position = i
-            r.save(update_fields=["position"])
-
-
-def _promote_from_waitlist_if_needed(game: Game) -> None:
-    confirmed_count = game.registrations.filter(status=Registration.Status.CONFIRMED).count()
-    if confirmed_count < game.capacity:
-        next_wait = game.registrations.filter(status=Registration.Status.WAITLIST).order_by("created_at").first()
-        if next_wait:
-            next_wait.status = Registration.Status.CONFIRMED
-            next_wait.position = None
-            next_wait.save()
-            Activity.objects.create(
-                game=game, registration=next_wait,
-                kind=Activity.Kind.MOVED,
-                message=f"Auto-promoted from waitlist: {next_wait.name}"
-            )
-            _recalc_positions(game)
+def _page_url(request, key, cursor=None):
+    """Current dashboard URL with one cursor swapped (None = first page)."""
+    params = request.GET.copy()
+    if cursor is None:
+        params.pop(key, None)
+    else:
+        params[key] = cursor
+    return f"{request.path}?{params.urlencode()}" if params else request.path
 
 
 def _recent_activity():
@@ -278,13 +331,21 @@ def dashboard(request):
     now = timezone.now()
 
     # ✅ FIX: show games that haven't ENDED yet (more reliable than start_time)
-    upcoming_games = Game.objects.filter(end_time__gte=now).order_by("start_time")
+    upcoming_games, next_games = pagination.keyset_page(
+        Game.objects.filter(end_time__gte=now), "start_time", request.GET.get("games_after"),
+    )
 
-    pending_regs = (
+    pending_qs = (
         Registration.objects.filter(status=Registration.Status.PENDING)
         .select_related("game")
-        .order_by("created_at")
+        .only("name", "email", "phone", "created_at", "game__title", "game__start_time", "game__location")
     )
+    pending_game = request.GET.get("pending_game", "")
+    if pending_game.isdigit():
+        pending_qs = pending_qs.filter(game_id=int(pending_game))
+    else:
+        pending_game = ""
+    pending_regs, next_pending = pagination.keyset_page(pending_qs, "created_at", request.GET.get("pending_after"))
 
     news_list = Announcement.objects.order_by("-created_at")[:20]
 
@@ -292,6 +353,11 @@ def dashboard(request):
         "game_form": game_form,
         "upcoming_games": upcoming_games,
         "pending_regs": pending_regs,
+        "pending_game": pending_game,
+        "next_games_url": _page_url(request, "games_after", next_games) if next_games else None,
+        "first_games_url": _page_url(request, "games_after") if "games_after" in request.GET else None,
+        "next_pending_url": _page_url(request, "pending_after", next_pending) if next_pending else None,
+        "first_pending_url": _page_url(request, "pending_after") if "pending_after" in request.GET else None,
         "recent_activity": _recent_activity(),
         "news_list": news_list,
         "now": now,
@@ -303,44 +369,71 @@ def dashboard(request):
 def approve_registration(request, reg_id: int):
     reg = get_object_or_404(Registration, id=reg_id)
 
-    if reg.status != Registration.Status.PENDING:
-        messages.error(request, "This request was already processed.")
+    try:
+        reg, msg = roster.approve(reg)
+    except roster.TransitionError as e:
+        messages.error(request, str(e))
         return redirect("games:dashboard")
 
-    game = reg.game
-    confirmed_count = game.registrations.filter(status=Registration.Status.CONFIRMED).count()
+    messages.success(request, msg)
+    return redirect("games:dashboard")
 
-    if confirmed_count < game.capacity:
-        reg.status = Registration.Status.CONFIRMED
-        msg = f"Approved (CONFIRMED): {reg.name}"
-    else:
-        reg.status = Registration.Status.WAITLIST
-        msg = f"Approved (WAITLIST): {reg.name}"
 
-    reg.position = None
-    reg.save()
-    _recalc_positions(game)
+@organizer_required
+def deny_registration(request, reg_id: int):
+    reg = get_object_or_404(Registration, id=reg_id)
+
+    try:
+        reg, msg = roster.deny(reg)
+    except roster.TransitionError as e:
+        messages.error(request, str(e))
+        return redirect("games:dashboard")
 
-    Activity.objects.create(game=game, registration=reg, kind=Activity.Kind.APPROVED, message=msg)
     messages.success(request, msg)
     return redirect("games:dashboard")
 
 
 @organizer_required
-def deny_registration(request, reg_id: int):
-    reg = get_object_or_404(Registration, id=reg_id)
+def bulk_registrations(request):
+    """Approve/deny a selection of pending requests, or the first N for a game."""
+    if request.method != "POST":
+        return redirect("games:dashboard")
 
-    if reg.status != Registration.Status.PENDING:
-        messages.error(request, "This request was already processed.")
+    action = request.POST.get("action")
+    if action not in ["approve", "deny"]:
+        messages.error(request, "Unknown bulk action.")
         return redirect("games:dashboard")
 
-    reg.status = Registration.Status.DENIED
-    reg.position = None
-    reg.save()
+    game_id = request.POST.get("game_id", "").strip()
+    first_n = request.POST.get("first_n", "").strip()
 
-    Activity.objects.create(game=reg.game, registration=reg, kind=Activity.Kind.DENIED, message=f"Denied: {reg.name}")
-    messages.success(request, f"Denied: {reg.name}")
-    return redirect("games:dashboard")
+    if first_n:
+        if not game_id.isdigit():
+            messages.error(request, "Pick a game to process.")
+            return redirect("games:dashboard")
+        game = get_object_or_404(Game, id=game_id)
+        if not first_n.isdigit() or int(first_n) < 1:
+            messages.error(request, "Enter how many requests to process.")
+            return redirect("games:manage_game", game_id=game.id)
+        totals = roster.decide_pending(game.id, action == "approve", first_n=int(first_n))
+        back = redirect("games:manage_game", game_id=game.id)
+    else:
+        reg_ids = [int(x) for x in request.POST.getlist("reg_ids") if x.isdigit()]
+        regs = Registration.objects.filter(id__in=reg_ids, status=Registration.Status.PENDING).only("game_id")
+        to_status = Registration.Status.CONFIRMED if action == "approve" else Registration.Status.DENIED
+        changed = roster.transition(regs, to_status, Registration.ORGANIZER, expect=Registration.Status.PENDING)
+        totals = Counter(reg.status for reg in changed)
+        back = redirect("games:dashboard")
+
+    if not totals:
+        messages.error(request, "Nothing to process — those requests were already handled.")
+    elif action == "approve":
+        confirmed = totals[Registration.Status.CONFIRMED]
+        waitlisted = totals[Registration.Status.WAITLIST]
+        messages.success(request, f"Approved {confirmed + waitlisted} ({confirmed} confirmed, {waitlisted} waitlisted).")
+    else:
+        messages.success(request, f"Denied {totals[Registration.Status.DENIED]}.")
+    return back
 
 
 @organizer_required
@@ -350,7 +443,10 @@ def edit_game(request, game_id: int):
     if request.method == "POST":
         form = GameForm(request.POST, instance=game)
         if form.is_valid():
-            form.save()
+            # only write the edited fields so roster counters aren't clobbered
+            game = form.save(commit=False)
+            game.save(update_fields=GameForm.Meta.fields)
+            roster.bump_version(game)
             Activity.objects.create(game=game, kind=Activity.Kind.MOVED, message=f"Game edited: {game.title}")
             messages.success(request, "Game updated.")
             return redirect("games:dashboard")
@@ -366,8 +462,19 @@ def delete_game(request, game_id: int):
     game = get_object_or_404(Game, id=game_id)
 
     if request.method == "POST":
-        Activity.objects.create(game=game, kind=Activity.Kind.MOVED, message=f"Game deleted: {game.title}")
-        game.delete()
+        with transaction.atomic():
+            # One DELETE per table. The ORM cascade would load every
+            # registration id and delete them 100 at a time.
+            Activity.objects.filter(game=game).delete()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM {table} WHERE {column} = %s".format(
+                        table=connection.ops.quote_name(Registration._meta.db_table),
+                        column=connection.ops.quote_name(Registration._meta.get_field("game").column),
+                    ),
+                    [game.id],
+                )
+            game.delete()
         messages.success(request, "Game deleted.")
         return redirect("games:dashboard")
 
@@ -391,20 +498,53 @@ def manage_game(request, game_id: int):
     })
 
 
+@organizer_required
+def import_registrations(request, game_id: int):
+    game = get_object_or_404(Game, id=game_id)
+    upload = request.FILES.get("csv_file")
+
+    if request.method != "POST" or not upload:
+        messages.error(request, "Choose a CSV file to import.")
+        return redirect("games:manage_game", game_id=game.id)
+
+    lines = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        result = imports.import_registrations(game, lines)
+    except UnicodeDecodeError:
+        messages.error(request, "The file must be UTF-8 CSV.")
+        return redirect("games:manage_game", game_id=game.id)
+    except csv.Error as exc:
+        messages.error(request, f"The file isn't a valid CSV: {exc}")
+        return redirect("games:manage_game", game_id=game.id)
+    except IntegrityError:
+        # a sign-up for one of the emails landed mid-import; nothing was written
+        messages.error(request, "Someone signed up with one of these emails during the import. Please try again.")
+        return redirect("games:manage_game", game_id=game.id)
+
+    if result.created:
+        messages.success(
+            request, f"Imported {result.created} player(s): {result.confirmed} confirmed, {result.waitlisted} waitlisted."
+        )
+    for line_no, error in result.errors[:10]:
+        messages.error(request, f"Line {line_no}: {error}")
+    if len(result.errors) > 10:
+        messages.error(request, f"…and {len(result.errors) - 10} more row error(s).")
+
+    return redirect("games:manage_game", game_id=game.id)
+
+
 @organizer_required
 def organizer_remove_player(request, game_id: int, reg_id: int):
     game = get_object_or_404(Game, id=game_id)
     reg = get_object_or_404(Registration, id=reg_id, game=game)
 
-    reg.status = Registration.Status.REMOVED
-    reg.position = None
-    reg.save()
-
-    Activity.objects.create(game=game, registration=reg, kind=Activity.Kind.REMOVED, message=f"Removed: {reg.name}")
-    _promote_from_waitlist_if_needed(game)
-    _recalc_positions(game)
+    try:
+        reg, msg = roster.remove(reg)
+    except roster.TransitionError as e:
+        messages.error(request, str(e))
+        return redirect("games:manage_game", game_id=game.id)
 
-    messages.success(request, f"Removed: {reg.name}")
+    messages.success(request, msg)
     return redirect("games:manage_game", game_id=game.id)
 
 
@@ -413,25 +553,59 @@ def organizer_move_player(request, game_id: int, reg_id: int, target: str):
     game = get_object_or_404(Game, id=game_id)
     reg = get_object_or_404(Registration, id=reg_id, game=game)
 
-    target = target.upper()
-    if target not in ["CONFIRMED", "WAITLIST", "PENDING"]:
-        messages.error(request, "Invalid target list.")
+    try:
+        reg, msg = roster.move(reg, target)
+    except roster.TransitionError as e:
+        messages.error(request, str(e))
         return redirect("games:manage_game", game_id=game.id)
 
-    if target == "CONFIRMED":
-        confirmed_count = game.registrations.filter(status=Registration.Status.CONFIRMED).count()
-        if confirmed_count >= game.capacity and reg.status != Registration.Status.CONFIRMED:
-            target = "WAITLIST"
+    messages.success(request, msg)
+    return redirect("games:manage_game", game_id=game.id)
 
-    reg.status = target
-    reg.position = None
-    reg.save()
 
-    Activity.objects.create(game=game, registration=reg, kind=Activity.Kind.MOVED, message=f"Moved: {reg.name} → {target}")
-    _recalc_positions(game)
+# -------------------------
+# Exports (streamed)
+# -------------------------
 
-    messages.success(request, f"Moved: {reg.name} → {target}")
-    return redirect("games:manage_game", game_id=game.id)
+def _export_response(request, name, rows_func, columns, filter_key):
+    fmt = request.GET.get("format", "csv")
+    if fmt not in exports.FORMATS:
+        return HttpResponseBadRequest("format must be csv or jsonl.")
+
+    try:
+        rows = rows_func(
+            game=request.GET.get("game"),
+            since=request.GET.get("since"),
+            until=request.GET.get("until"),
+            **{filter_key: request.GET.get(filter_key)},
+        )
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    content = exports.render(rows, columns, fmt)
+    if isinstance(request, ASGIRequest):
+        # a sync iterator would be read into memory whole under ASGI
+        content = exports.arender(content)
+    response = StreamingHttpResponse(content, content_type=exports.FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{name}.{fmt}"'
+    return response
+
+
+@organizer_required
+def export_registrations(request):
+    return _export_response(request, "registrations", exports.registration_rows, exports.REGISTRATION_COLUMNS, "status")
+
+
+@organizer_required
+def export_activity(request):
+    return _export_response(request, "activity", exports.activity_rows, exports.ACTIVITY_COLUMNS, "kind")
+
+
+@organizer_required
+@require_GET
+def prometheus_metrics(request):
+    """Per-view timings and throttle rejections recorded by this worker."""
+    return HttpResponse(metrics.metrics_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 # -------------------------